@@ -1,7 +1,14 @@
 import os
+import sys
 import xml.etree.ElementTree as ET
 from collections import Counter # <-- 1. Importar Counter
 
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+from core.anim_data import load_anim_data  # noqa: E402
+
 def count_animation_names(search_path='.'):
     """
     Busca en el directorio especificado carpetas que contengan una subcarpeta 'Animations'
@@ -33,17 +40,9 @@ def count_animation_names(search_path='.'):
             if os.path.isfile(anim_xml_path):
                 print(f"  -> Procesando archivo en: {anim_xml_path}")
                 try:
-                    # Parseamos el archivo XML
-                    tree = ET.parse(anim_xml_path)
-                    root = tree.getroot()
-                    
-                    # Buscamos todos los tags <Anim>
-                    for anim_node in root.findall('.//Anims/Anim'):
-                        name_node = anim_node.find('Name')
-                        if name_node is not None and name_node.text:
-                            name = name_node.text.strip()
-                            # 3. Incrementar el contador para esta animación
-                            animation_counts[name] += 1
+                    # Usamos el modelo compartido de AnimData.xml (parseado una sola vez)
+                    # 3. Incrementar el contador para cada animación
+                    animation_counts.update(load_anim_data(anim_xml_path).names)
                 
                 except ET.ParseError as e:
                     print(f"    [ERROR] No se pudo procesar el archivo XML '{anim_xml_path}': {e}")
@@ -13,6 +13,9 @@ Usage:
     python Scripts/export_firmware_sheets.py --target firmware
     python Scripts/export_firmware_sheets.py --target web
     python Scripts/export_firmware_sheets.py --target none
+    python Scripts/export_firmware_sheets.py --workers 8
+    python Scripts/export_firmware_sheets.py --force
+    python Scripts/export_firmware_sheets.py --stage copy
 """
 
 import argparse
@@ -25,6 +28,7 @@ if SRC not in sys.path:
 
 from core.firmware_exporter import (  # noqa: E402
     export_all, DEFAULT_FRAMES, DEFAULT_SCALE, DEFAULT_IDLE_FRAMES,
+    STAGE_MODES, DEFAULT_STAGE_MODE,
 )
 
 
@@ -49,6 +53,14 @@ def main():
     ap.add_argument("--target", choices=["firmware", "web", "both", "none"], default="both",
                     help="Stage copy-ready trees for the hibitomo web, the firmware, "
                          "both (default), or none (flat output only).")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                    help="Worker processes, one creature per task (default: CPU count; "
+                         "1 converts everything in this process).")
+    ap.add_argument("--force", action="store_true",
+                    help="Reconvert every creature, ignoring firmware_manifest.json in --out.")
+    ap.add_argument("--stage", choices=STAGE_MODES, default=DEFAULT_STAGE_MODE,
+                    help=f"How the target trees reference the flat output (default "
+                         f"{DEFAULT_STAGE_MODE}; falls back to copy where unsupported).")
     args = ap.parse_args()
 
     downloads = os.path.abspath(args.downloads)
@@ -66,10 +78,12 @@ def main():
 
     print(f"Exporting from {downloads}\n"
           f"            to {out} (per-species cell, frames={args.frames}, "
-          f"scale={args.scale}x, idle_frames={args.idle_frames}, target={args.target})\n")
+          f"scale={args.scale}x, idle_frames={args.idle_frames}, target={args.target}, "
+          f"workers={args.workers})\n")
     ok, fail = export_all(downloads, out, targets=targets,
                           frames=args.frames, scale=args.scale,
-                          idle_frames=args.idle_frames)
+                          idle_frames=args.idle_frames, workers=args.workers,
+                          force=args.force, stage=args.stage)
     return 0 if fail == 0 else 1
 
 
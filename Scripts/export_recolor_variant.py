@@ -0,0 +1,65 @@
+"""
+CLI: export a palette-swap recolour variant (e.g. shiny) of generated characters.
+
+Maps each character's palette (first row of its own sprite_recolor sheet) onto the
+palette row of another recolor sheet, then rewrites the already exported assets
+with it: the indexed sprites of `AnimationData/` (palette entries only) into
+`AnimationData-<name>/`, and optionally the character's firmware/web sheet into
+`<firmware-out>/<name>/`. Nothing is split, matched or regenerated.
+
+Usage:
+    python Scripts/export_recolor_variant.py --palette shiny/sprite_recolor-0001-0000-0001.png --project "0001 Bulbasaur" --name shiny
+    python Scripts/export_recolor_variant.py --palette alt.png --project "0001 Bulbasaur" --name alt --firmware-out firmware_output
+"""
+
+import argparse
+import os
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+from core.firmware_exporter import output_name  # noqa: E402
+from core.recolor import load_variant_color_map, export_animation_variant, export_firmware_variant  # noqa: E402
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Export a palette-swap recolour variant of generated characters.")
+    ap.add_argument("--downloads", default="pmd_projects/downloads",
+                    help="Folder with project subfolders (default pmd_projects/downloads)")
+    ap.add_argument("--project", action="append", required=True,
+                    help="Project folder name inside --downloads (repeatable)")
+    ap.add_argument("--palette", required=True,
+                    help="sprite_recolor sheet whose first row is the variant palette")
+    ap.add_argument("--name", required=True,
+                    help="Variant name, used for the output folder names (e.g. shiny)")
+    ap.add_argument("--firmware-out", default=None,
+                    help="Also recolour <firmware-out>/<id>.png into <firmware-out>/<name>/")
+    args = ap.parse_args()
+
+    downloads = os.path.abspath(args.downloads)
+    fail = 0
+    for folder in args.project:
+        project = os.path.join(downloads, folder)
+        try:
+            color_map = load_variant_color_map(project, args.palette)
+            if os.path.isdir(os.path.join(project, "AnimationData")):
+                export_animation_variant(project, color_map, args.name)
+            if args.firmware_out:
+                sheet = os.path.join(args.firmware_out, output_name(folder) + ".png")
+                if os.path.exists(sheet):
+                    out_png = export_firmware_variant(sheet, os.path.join(args.firmware_out, args.name,
+                                                                          os.path.basename(sheet)), color_map)
+                    print(f"  {args.name}: {folder} -> {out_png}")
+                else:
+                    print(f"  SKIP firmware sheet for {folder}: {sheet} not found")
+        except Exception as e:
+            fail += 1
+            print(f"  SKIP {folder}: {e}")
+
+    return 0 if fail == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+"""
+CLI: generate the optimized AnimationData of PMD characters without the GUI.
+
+Runs the same AnimationDataHandler pipeline as the in-app Batch tool (sprite
+matching, corrected placement, export_optimized_animation) over a `downloads/`
+folder. Only animations whose inputs changed since the last run are regenerated
+(see the per-project animation_data_manifest.json). Characters can be split
+deterministically across machines with --shard, and a JSON summary can be
+written for build tooling.
+
+Usage:
+    python Scripts/generate_animation_data.py
+    python Scripts/generate_animation_data.py --downloads pmd_projects/downloads --workers 8
+    python Scripts/generate_animation_data.py --shard 1/4 --summary shard1.json
+    python Scripts/generate_animation_data.py --sprite-pool --force
+    python Scripts/generate_animation_data.py --trace trace.log --workers 1
+"""
+
+import argparse
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import sys
+import time
+import zlib
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+from core import log_utils  # noqa: E402
+from core.anim_data import ANIM_DATA_FILENAME  # noqa: E402
+from core.animation_data_handler import AnimationDataHandler, export_animation_task  # noqa: E402
+
+
+def parse_shard(value):
+    """Parses 'i/n' (1-based shard i of n)."""
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected i/n, got '{value}'")
+    if count < 1 or not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard must satisfy 1 <= i <= n, got '{value}'")
+    return index, count
+
+
+def in_shard(name, shard):
+    """Stable assignment of a character folder to a shard (independent of the other folders)."""
+    index, count = shard
+    return zlib.crc32(name.encode("utf-8")) % count == index - 1
+
+
+def find_projects(downloads, shard):
+    """Character folders of this shard that have a Sprites folder and an AnimData.xml, sorted by name."""
+    projects = []
+    for name in sorted(os.listdir(downloads)):
+        path = os.path.join(downloads, name)
+        if not os.path.isdir(path) or not in_shard(name, shard):
+            continue
+        if (os.path.isdir(os.path.join(path, "Sprites"))
+                and os.path.isfile(os.path.join(path, "Animations", ANIM_DATA_FILENAME))):
+            projects.append(name)
+    return projects
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Generate optimized AnimationData for PMD characters.")
+    ap.add_argument("--downloads", default="pmd_projects/downloads",
+                    help="Folder with project subfolders (default pmd_projects/downloads)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                    help="Worker processes, one animation per task (default: CPU count; "
+                         "1 runs everything in this process).")
+    ap.add_argument("--shard", type=parse_shard, default=(1, 1),
+                    help="Only process shard i of n (1-based), e.g. 2/4. Characters are "
+                         "assigned by a hash of their folder name, so every host gets a "
+                         "stable, disjoint subset.")
+    ap.add_argument("--match-tolerance", type=float, default=None,
+                    help="Enable near-exact sprite matching with this mean RGBA difference.")
+    ap.add_argument("--sprite-pool", action="store_true",
+                    help="Export one shared, deduplicated sprite pool per character.")
+    ap.add_argument("--force", action="store_true",
+                    help="Regenerate every animation, ignoring the generation manifests.")
+    ap.add_argument("--summary", default=None,
+                    help="Write a JSON summary to this path ('-' for stdout).")
+    ap.add_argument("--log-level", default=None,
+                    help="Print core log records at this level (e.g. INFO, DEBUG) to stderr.")
+    ap.add_argument("--trace", default=None,
+                    help="Append debug records, including per-frame render offsets and "
+                         "per-animation timings, to this file.")
+    args = ap.parse_args()
+
+    # Set through the environment so worker processes log the same way.
+    if args.log_level:
+        os.environ[log_utils.LOG_LEVEL_ENV] = args.log_level
+        log_utils.configure(args.log_level.upper())
+    if args.trace:
+        os.environ[log_utils.TRACE_FILE_ENV] = os.path.abspath(args.trace)
+        log_utils.enable_trace(args.trace)
+
+    downloads = os.path.abspath(args.downloads)
+    if not os.path.isdir(downloads):
+        print(f"ERROR: downloads folder not found: {downloads}")
+        return 1
+
+    start = time.time()
+    project_names = find_projects(downloads, args.shard)
+    print(f"Generating from {downloads} (shard {args.shard[0]}/{args.shard[1]}, "
+          f"{len(project_names)} characters, workers={args.workers})\n")
+
+    projects = {}
+    tasks = []
+    for name in project_names:
+        try:
+            handler = AnimationDataHandler(os.path.join(downloads, name), match_tolerance=args.match_tolerance,
+                                           sprite_pool=args.sprite_pool)
+            current, stale = handler.plan_generation(force=args.force)
+        except Exception as e:
+            # Listed in the summary, but there is no handler or manifest to save.
+            projects[name] = {"handler": None, "manifest": {}, "stale": {},
+                              "generated": [], "up_to_date": 0,
+                              "failed": {ANIM_DATA_FILENAME: f"{type(e).__name__}: {e}"}}
+            print(f"  {name}: FAILED ({projects[name]['failed'][ANIM_DATA_FILENAME]})")
+            continue
+        projects[name] = {"handler": handler, "manifest": current, "stale": stale,
+                          "generated": [], "failed": {}, "up_to_date": len(current)}
+        tasks.extend((name, anim_name) for anim_name in stale)
+        if not handler.anim_data:
+            projects[name]["failed"][ANIM_DATA_FILENAME] = "No valid animation data found in XML."
+
+    def record(name, anim_name, saved, error):
+        project = projects[name]
+        if saved:
+            project["generated"].append(anim_name)
+            project["manifest"][anim_name] = project["stale"][anim_name]
+        else:
+            project["failed"][anim_name] = error or "No animation data generated."
+            print(f"  {name}: {anim_name} FAILED ({project['failed'][anim_name]})")
+
+    def args_of(name, anim_name):
+        return projects[name]["handler"].project_path, anim_name, args.match_tolerance, args.sprite_pool
+
+    try:
+        if args.workers <= 1:
+            for name, anim_name in tasks:
+                try:
+                    record(name, *export_animation_task(*args_of(name, anim_name)))
+                except Exception as e:
+                    record(name, anim_name, False, f"{type(e).__name__}: {e}")
+        else:
+            with concurrent.futures.ProcessPoolExecutor(
+                    max_workers=args.workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+                futures = {executor.submit(export_animation_task, *args_of(name, anim_name)): (name, anim_name)
+                           for name, anim_name in tasks}
+                for future in concurrent.futures.as_completed(futures):
+                    name, anim_name = futures[future]
+                    try:
+                        record(name, *future.result())
+                    except Exception as e:
+                        record(name, anim_name, False, f"{type(e).__name__}: {e}")
+    finally:
+        for name, project in projects.items():
+            if project["handler"] is not None:
+                project["handler"].save_generation_manifest(project["manifest"])
+
+    # Every export has finished, so pooled sprites no JSON references can go.
+    for name, project in projects.items():
+        if project["handler"] is not None:
+            try:
+                project["pruned"] = project["handler"].prune_sprite_pool()
+            except OSError as e:
+                print(f"  {name}: could not prune the sprite pool ({e})")
+
+    summary = {
+        "downloads": downloads,
+        "shard": list(args.shard),
+        "workers": args.workers,
+        "elapsed_seconds": round(time.time() - start, 2),
+        "totals": {
+            "characters": len(projects),
+            "generated": sum(len(p["generated"]) for p in projects.values()),
+            "up_to_date": sum(p["up_to_date"] for p in projects.values()),
+            "failed": sum(len(p["failed"]) for p in projects.values()),
+        },
+        "characters": {
+            name: {"generated": sorted(p["generated"]), "up_to_date": p["up_to_date"], "failed": p["failed"],
+                   "pruned_pool_sprites": p.get("pruned", 0)}
+            for name, p in projects.items()
+        },
+    }
+    for name, entry in summary["characters"].items():
+        print(f"  {name}: {len(entry['generated'])} generated, {entry['up_to_date']} up to date, "
+              f"{len(entry['failed'])} failed")
+    totals = summary["totals"]
+    print(f"\nDone in {summary['elapsed_seconds']}s: {totals['generated']} generated, "
+          f"{totals['up_to_date']} up to date, {totals['failed']} failed.")
+
+    if args.summary == "-":
+        print(json.dumps(summary, indent=2))
+    elif args.summary:
+        with open(args.summary, "w") as f:
+            json.dump(summary, f, indent=2)
+
+    return 0 if totals["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,11 +8,13 @@ import json
 import threading
 import queue
 import concurrent.futures
+import multiprocessing
 import urllib.request
 import re
-from tkinter import Frame, Label, Button, Entry, messagebox, filedialog, Canvas, Scrollbar, Text, END, Toplevel, StringVar, OptionMenu, Listbox, SINGLE, BOTH, Y, LEFT, RIGHT
+from tkinter import Frame, Label, Button, Entry, messagebox, filedialog, Canvas, Scrollbar, Text, END, Toplevel, StringVar, OptionMenu, Listbox, SINGLE, BOTH, Y, LEFT, RIGHT, BooleanVar, Checkbutton
 from PIL import Image, ImageTk
-from core.animation_data_handler import AnimationDataHandler
+from core.animation_data_handler import AnimationDataHandler, get_optimized_sprite_folder, export_animation_task
+from core.anim_data import ANIM_DATA_FILENAME, load_anim_data
 from individual.animation_creator import AnimationCreator
 from core.sprite_sheet_handler import SpriteSheetHandler
 from batch.esp32_asset_exporter import ESP32AssetExporter
@@ -20,6 +22,18 @@ from core.firmware_exporter import export_all as firmware_export_all
 
 class BatchResizer:
     DOWNLOADS_FOLDER_NAME = "downloads"  # Subfolder name for Pokemon data
+    # Defaults of the generation options shown in the task views.
+    # Near-exact sprite matching for animation generation (None = exact only,
+    # e.g. sprite_matcher.DEFAULT_MATCH_TOLERANCE to enable it).
+    MATCH_TOLERANCE = None
+    # Export one shared, deduplicated sprite pool per character instead of a sprite
+    # folder per animation (see AnimationDataHandler.export_optimized_animation).
+    SPRITE_POOL = False
+    # Generate animations in a process pool, one task per animation, instead of one
+    # thread per project (pixel work holds the GIL, so threads do not scale).
+    USE_PROCESS_POOL = False
+    # How often (seconds) the process-pool loop checks for a cancel while tasks run.
+    CANCEL_POLL_INTERVAL = 0.2
     
     def __init__(self, parent_frame, return_to_main_callback, update_breadcrumbs_callback=None, base_path=None):
         self.parent_frame = parent_frame
@@ -49,6 +63,14 @@ class BatchResizer:
         self.progress_queue = None
         self.worker_thread = None
 
+        # Task options (edited in the task views, read into plain attributes when a task starts)
+        self.match_tolerance_var = StringVar(value="" if self.MATCH_TOLERANCE is None else str(self.MATCH_TOLERANCE))
+        self.sprite_pool_var = BooleanVar(value=self.SPRITE_POOL)
+        self.use_process_pool_var = BooleanVar(value=self.USE_PROCESS_POOL)
+        self.match_tolerance = self.MATCH_TOLERANCE
+        self.sprite_pool = self.SPRITE_POOL
+        self.use_process_pool = self.USE_PROCESS_POOL
+
         self.setup_initial_view()
 
     def clear_frame(self):
@@ -127,7 +149,8 @@ class BatchResizer:
             title="Generate Optimized Animations",
             description=description,
             start_button_text="Start Generation",
-            worker_function=self._animation_generation_worker
+            worker_function=self._animation_generation_worker,
+            options_builder=self._build_anim_gen_options
         )
 
     def show_export_assets_combined_view(self):
@@ -163,7 +186,8 @@ class BatchResizer:
             title="Firmware / Web Export (1 sheet 8x4)",
             description=description,
             start_button_text="Start Export",
-            worker_function=self._firmware_export_worker
+            worker_function=self._firmware_export_worker,
+            options_builder=self._build_process_pool_option
         )
 
     def _firmware_export_worker(self, q):
@@ -176,7 +200,8 @@ class BatchResizer:
             q.put(f"Exporting overworld sheets -> {output_dir}\n")
             ok, fail = firmware_export_all(
                 self.downloads_folder, output_dir, log=q.put,
-                targets=("firmware", "web"))
+                targets=("firmware", "web"),
+                workers=(os.cpu_count() or 1) if self.use_process_pool else 1)
             q.put(f"DONE:{ok}:{fail}")
         except Exception as e:
             q.put(f"ERROR: {e}")
@@ -184,11 +209,39 @@ class BatchResizer:
 
     # --- Generic Task Execution Framework ---
 
-    def _setup_task_view(self, title, description, start_button_text, worker_function):
+    def _build_process_pool_option(self, parent):
+        Checkbutton(parent, text="Use all CPU cores (one worker process per core)",
+                    variable=self.use_process_pool_var).pack(anchor='w')
+
+    def _build_anim_gen_options(self, parent):
+        self._build_process_pool_option(parent)
+        Checkbutton(parent, text="Export one shared, deduplicated sprite pool per character",
+                    variable=self.sprite_pool_var).pack(anchor='w')
+        tolerance_frame = Frame(parent); tolerance_frame.pack(anchor='w')
+        Label(tolerance_frame, text="Near-exact match tolerance (mean RGBA difference, empty = exact only):").pack(side='left')
+        Entry(tolerance_frame, textvariable=self.match_tolerance_var, width=8).pack(side='left', padx=5)
+
+    def _read_task_options(self):
+        """Copies the option widgets into plain attributes for the worker thread. Returns False if a value is invalid."""
+        tolerance = self.match_tolerance_var.get().strip()
+        try:
+            match_tolerance = float(tolerance) if tolerance else None
+        except ValueError:
+            messagebox.showerror("Invalid Option", f"Match tolerance must be a number, got '{tolerance}'.")
+            return False
+        if match_tolerance is not None and match_tolerance < 0:
+            messagebox.showerror("Invalid Option", "Match tolerance cannot be negative.")
+            return False
+        self.match_tolerance = match_tolerance
+        self.sprite_pool = self.sprite_pool_var.get()
+        self.use_process_pool = self.use_process_pool_var.get()
+        return True
+
+    def _setup_task_view(self, title, description, start_button_text, worker_function, options_builder=None):
         if self.update_breadcrumbs:
             path = self.base_path + [
                 ("Batch Tasks", self.show_task_selection_view),
-                (title, lambda: self._setup_task_view(title, description, start_button_text, worker_function))
+                (title, lambda: self._setup_task_view(title, description, start_button_text, worker_function, options_builder))
             ]
             self.update_breadcrumbs(path)
         
@@ -200,6 +253,9 @@ class BatchResizer:
         if description:
             Label(self.main_frame, text=description, wraplength=600).pack(pady=5)
         Label(self.main_frame, text=f"Target Folder: {self.parent_folder}", font=('Arial', 10)).pack(pady=5)
+        if options_builder:
+            options_frame = Frame(self.main_frame); options_frame.pack(pady=5)
+            options_builder(options_frame)
 
         self.action_button = Button(self.main_frame, text=start_button_text, command=lambda: self._start_task(worker_function), font=('Arial', 12), width=20)
         self.action_button.pack(pady=20)
@@ -213,6 +269,8 @@ class BatchResizer:
         self.log_text.pack(side='left', fill='both', expand=True)
 
     def _start_task(self, worker_function):
+        if not self._read_task_options():
+            return
         self.cancel_operation = False
         self._clear_log()
         self.action_button.config(text="Cancel", command=self.request_cancel, bg="tomato")
@@ -267,43 +325,63 @@ class BatchResizer:
 
     # --- Task Worker Functions (Background Logic) ---
 
+    def _open_project_for_anim_gen(self, project_path, folder_name, q):
+        """Returns the project's AnimationDataHandler, or None (with a log message) if it cannot be processed."""
+        # Check if Animations folder and AnimData.xml exist
+        animations_folder = os.path.join(project_path, "Animations")
+        animdata_path = os.path.join(animations_folder, "AnimData.xml")
+        
+        if not os.path.exists(animations_folder):
+            q.put(f"  -> Skipping {folder_name}: No Animations folder found.")
+            return None
+        
+        if not os.path.exists(animdata_path):
+            q.put(f"  -> Skipping {folder_name}: AnimData.xml not found in Animations folder.")
+            return None
+        
+        handler = AnimationDataHandler(project_path, match_tolerance=self.match_tolerance, sprite_pool=self.sprite_pool)
+        if not handler.anim_data:
+            q.put(f"  -> Skipping {folder_name}: No valid animation data found in XML.")
+            return None
+        return handler
+
     def _process_project_for_anim_gen(self, project_path, folder_name, q):
         if self.cancel_operation:
             return 0, 0, True
 
         q.put(f"Processing: {folder_name}")
         try:
-            # Check if Animations folder and AnimData.xml exist
-            animations_folder = os.path.join(project_path, "Animations")
-            animdata_path = os.path.join(animations_folder, "AnimData.xml")
-            
-            if not os.path.exists(animations_folder):
-                q.put(f"  -> Skipping {folder_name}: No Animations folder found.")
-                return 0, 1, False
-            
-            if not os.path.exists(animdata_path):
-                q.put(f"  -> Skipping {folder_name}: AnimData.xml not found in Animations folder.")
-                return 0, 1, False
-            
-            handler = AnimationDataHandler(project_path)
-            if not handler.anim_data:
-                q.put(f"  -> Skipping {folder_name}: No valid animation data found in XML.")
+            handler = self._open_project_for_anim_gen(project_path, folder_name, q)
+            if handler is None:
                 return 0, 1, False
 
-            project_anims_saved = 0
-            for index, anim in enumerate(handler.anim_data):
-                if self.cancel_operation:
-                    return project_anims_saved, 0, True
-                
-                json_data = handler.generate_animation_data(index)
-                if json_data:
-                    _, error = handler.export_optimized_animation(json_data)
-                    if error:
-                        q.put(f"  -> Failed to export {anim['name']} for {folder_name}: {error}")
-                    else:
-                        project_anims_saved += 1
+            # Only animations whose inputs changed since the last run are regenerated.
+            updated_manifest, stale = handler.plan_generation()
+            project_anims_saved, project_anims_current = 0, len(updated_manifest)
+            try:
+                for index, anim in enumerate(handler.anim_data):
+                    if self.cancel_operation:
+                        return project_anims_saved, 0, True
+                    
+                    fingerprint = stale.get(anim["name"])
+                    if fingerprint is None:
+                        continue
+                    
+                    json_data = handler.generate_animation_data(index)
+                    if json_data:
+                        _, error = handler.export_optimized_animation(json_data)
+                        if error:
+                            q.put(f"  -> Failed to export {anim['name']} for {folder_name}: {error}")
+                        else:
+                            project_anims_saved += 1
+                            updated_manifest[anim["name"]] = fingerprint
+            finally:
+                handler.save_generation_manifest(updated_manifest)
+            self._prune_sprite_pool(handler, folder_name, q)
             
-            if project_anims_saved == 0 and not self.cancel_operation:
+            if project_anims_current:
+                q.put(f"  -> {folder_name}: {project_anims_saved} regenerated, {project_anims_current} up to date.")
+            if project_anims_saved == 0 and project_anims_current == 0 and not self.cancel_operation:
                  return 0, 1, False
             
             return project_anims_saved, 0, False
@@ -318,29 +396,23 @@ class BatchResizer:
         # Filter only valid Pokemon folders (format: "XXXX Name") 
         valid_folders = [fn for fn in self.project_folders if self._is_valid_pokemon_folder(fn)]
         
-        # Only process folders that have Sprites folder (step 2 completed) and don't have AnimationData yet
+        # Only process folders that have Sprites folder (step 2 completed); animations whose
+        # inputs are unchanged since the last run are skipped per project (see the manifest).
         folders_to_process = []
         skipped_no_sprites = 0
-        skipped_has_animdata = 0
         
         for fn in valid_folders:
             folder_path = os.path.join(self.downloads_folder, fn)
             sprites_folder = os.path.join(folder_path, "Sprites")
-            animdata_folder = os.path.join(folder_path, "AnimationData")
             
             if not os.path.exists(sprites_folder):
                 skipped_no_sprites += 1
                 continue
-            
-            if os.path.exists(animdata_folder):
-                skipped_has_animdata += 1
-                continue
                 
             folders_to_process.append(fn)
         
         q.put(f"Found {len(folders_to_process)} folders to process (out of {len(valid_folders)} valid folders)")
-        q.put(f"Skipping {skipped_no_sprites} folders without Sprites folder (step 2 not completed)")
-        q.put(f"Skipping {skipped_has_animdata} folders that already have AnimationData\n")
+        q.put(f"Skipping {skipped_no_sprites} folders without Sprites folder (step 2 not completed)\n")
         
         if not folders_to_process:
             q.put("No folders need processing.")
@@ -349,6 +421,11 @@ class BatchResizer:
         
         tasks = [(os.path.join(self.downloads_folder, fn), fn) for fn in folders_to_process]
 
+        if self.use_process_pool:
+            total_anims_saved, projects_failed = self._run_anim_gen_process_pool(tasks, q)
+            q.put("DONE:CANCEL" if self.cancel_operation else f"DONE:{total_anims_saved}:{projects_failed}")
+            return
+
         # Use more workers for better parallelization (default is CPU count, we use CPU count * 2)
         max_workers = min(32, (os.cpu_count() or 4) * 2)
         with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
@@ -373,6 +450,102 @@ class BatchResizer:
         else:
             q.put(f"DONE:{total_anims_saved}:{projects_failed}")
 
+    def _prune_sprite_pool(self, handler, folder_name, q):
+        try:
+            removed = handler.prune_sprite_pool()
+            if removed:
+                q.put(f"  -> {folder_name}: removed {removed} unused pooled sprites.")
+        except OSError as e:
+            q.put(f"  -> Could not prune the sprite pool of {folder_name}: {e}")
+
+    def _run_anim_gen_process_pool(self, tasks, q):
+        """
+        Process-pool variant of the animation generation loop. Out-of-date animations
+        are planned here (see the generation manifest) and each one runs as a separate
+        export_animation_task. Progress goes to q as each task finishes, and each project's
+        manifest is saved once its last task is done. A cancel drops the queued tasks and
+        returns without waiting for the running ones. Returns (anims_saved, projects_failed).
+        """
+        total_anims_saved, projects_failed = 0, 0
+        projects = {}
+        for project_path, folder_name in tasks:
+            if self.cancel_operation:
+                return total_anims_saved, projects_failed
+            q.put(f"Processing: {folder_name}")
+            try:
+                handler = self._open_project_for_anim_gen(project_path, folder_name, q)
+                if handler is None:
+                    projects_failed += 1
+                    continue
+                current, stale = handler.plan_generation()
+                projects[folder_name] = {"handler": handler, "manifest": current, "stale": stale,
+                                         "saved": 0, "current": len(current), "pending": 0}
+            except Exception as e:
+                q.put(f"  -> Critical error processing project '{folder_name}': {e}")
+                projects_failed += 1
+
+        def finish_project(folder_name):
+            nonlocal total_anims_saved, projects_failed
+            project = projects[folder_name]
+            project["handler"].save_generation_manifest(project["manifest"])
+            self._prune_sprite_pool(project["handler"], folder_name, q)
+            if project["current"]:
+                q.put(f"  -> {folder_name}: {project['saved']} regenerated, {project['current']} up to date.")
+            total_anims_saved += project["saved"]
+            if project["saved"] == 0 and project["current"] == 0:
+                projects_failed += 1
+
+        num_tasks = sum(len(project["stale"]) for project in projects.values())
+        q.put(f"Generating {num_tasks} animations in worker processes...")
+        max_workers = os.cpu_count() or 4
+        # 'spawn' avoids forking the Tk process and its threads.
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+        try:
+            futures = {}
+            for folder_name, project in projects.items():
+                for anim_name in project["stale"]:
+                    future = executor.submit(export_animation_task, project["handler"].project_path, anim_name,
+                                             self.match_tolerance, self.sprite_pool)
+                    futures[future] = (folder_name, anim_name)
+                project["pending"] = len(project["stale"])
+                if not project["pending"]:
+                    finish_project(folder_name)
+
+            completed, not_done = 0, set(futures)
+            while not_done and not self.cancel_operation:
+                done, not_done = concurrent.futures.wait(not_done, timeout=self.CANCEL_POLL_INTERVAL,
+                                                         return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    folder_name, anim_name = futures[future]
+                    project = projects[folder_name]
+                    completed, saved = completed + 1, False
+                    try:
+                        _, saved, error = future.result()
+                        if error:
+                            q.put(f"  -> Failed to export {anim_name} for {folder_name}: {error}")
+                        if saved:
+                            project["saved"] += 1
+                            project["manifest"][anim_name] = project["stale"][anim_name]
+                    except Exception as exc:
+                        q.put(f"  -> Exception for '{folder_name}' ({anim_name}): {exc}")
+                    q.put(f"  [{completed}/{num_tasks}] {folder_name}: {anim_name} {'done' if saved else 'failed'}")
+                    project["pending"] -= 1
+                    if not project["pending"]:
+                        finish_project(folder_name)
+        finally:
+            # On cancel, queued tasks are dropped and running ones finish in the background.
+            if self.cancel_operation:
+                for future in futures:
+                    future.cancel()
+            executor.shutdown(wait=not self.cancel_operation, cancel_futures=True)
+
+        if self.cancel_operation:
+            # Keep what finished before the cancel so the next run does not redo it.
+            for project in projects.values():
+                if project["pending"]:
+                    project["handler"].save_generation_manifest(project["manifest"])
+        return total_anims_saved, projects_failed
+
     def _export_assets_combined_worker(self, q):
         """Combined worker that exports both 1x and 2x assets in one pass."""
         main_path = pathlib.Path(self.parent_folder)
@@ -478,6 +651,7 @@ class BatchResizer:
         output_char_dir_x2 = output_dir_x2 / char_name
         output_char_dir.mkdir()
         output_char_dir_x2.mkdir()
+        exported_pool_sprites = set()
         
         for json_name in sorted(list(common_animations)):
             if self.cancel_operation: return
@@ -503,15 +677,29 @@ class BatchResizer:
             
             # Copy/scale sprites
             anim_name = json_name.removesuffix("-AnimData.json")
-            source_sprites_path = source_anim_path / anim_name
+            source_sprites_path = pathlib.Path(get_optimized_sprite_folder(source_anim_path, anim_name, data))
             if source_sprites_path.is_dir():
-                # 1x - just copy
-                shutil.copytree(source_sprites_path, output_char_dir / anim_name)
+                dest_sprites_dir = output_char_dir / source_sprites_path.name
+                dest_sprites_dir_x2 = output_char_dir_x2 / source_sprites_path.name
+                if data.get('sprite_pool'):
+                    # Shared pool - copy only the referenced sprites not exported for this character yet
+                    referenced = {f"sprite_{frame['id']}.png" for group in data.get('sprites', {}).values()
+                                  for frame in group.get('frames', []) if frame.get('id', '0') != '0'}
+                    sprite_files = [source_sprites_path / name for name in sorted(referenced - exported_pool_sprites)
+                                    if (source_sprites_path / name).exists()]
+                    exported_pool_sprites.update(referenced)
+                    dest_sprites_dir.mkdir(exist_ok=True)
+                    dest_sprites_dir_x2.mkdir(exist_ok=True)
+                    for sprite_file in sprite_files:
+                        shutil.copy2(sprite_file, dest_sprites_dir / sprite_file.name)
+                else:
+                    # 1x - just copy
+                    shutil.copytree(source_sprites_path, dest_sprites_dir)
+                    dest_sprites_dir_x2.mkdir()
+                    sprite_files = list(source_sprites_path.glob("*.png"))
                 
                 # 2x - resize each sprite
-                dest_sprites_dir_x2 = output_char_dir_x2 / anim_name
-                dest_sprites_dir_x2.mkdir()
-                for sprite_file in source_sprites_path.glob("*.png"):
+                for sprite_file in sprite_files:
                     if self.cancel_operation: return
                     with Image.open(sprite_file) as img:
                         img.resize((img.width * 2, img.height * 2), Image.NEAREST).save(dest_sprites_dir_x2 / sprite_file.name)
@@ -839,70 +1027,20 @@ class BatchResizer:
 
     def _get_walk_frame_size(self, project_path):
         """Gets the Walk animation frame size from AnimData.xml."""
-        import xml.etree.ElementTree as ET
-        
-        animations_folder = os.path.join(project_path, "Animations")
-        animdata_path = os.path.join(animations_folder, "AnimData.xml")
+        animdata_path = os.path.join(project_path, "Animations", ANIM_DATA_FILENAME)
         
         if not os.path.exists(animdata_path):
             return None
         
         try:
-            tree = ET.parse(animdata_path)
-            root = tree.getroot()
-            anims_root = root.find("Anims")
-            
-            if anims_root is None:
-                return None
-            
-            # Look for Walk animation
-            for anim in anims_root.findall("Anim"):
-                name_elem = anim.find("Name")
-                if name_elem is not None and name_elem.text == "Walk":
-                    fw_elem = anim.find("FrameWidth")
-                    fh_elem = anim.find("FrameHeight")
-                    
-                    if fw_elem is not None and fh_elem is not None:
-                        fw = int(fw_elem.text)
-                        fh = int(fh_elem.text)
-                        # Return the larger dimension (usually they're equal)
-                        return max(fw, fh)
-                    
-                    # If Walk is a CopyOf another animation, find the source
-                    copy_of = anim.find("CopyOf")
-                    if copy_of is not None:
-                        return self._get_anim_size_by_name(anims_root, copy_of.text)
-            
-            return None
+            size = load_anim_data(animdata_path).frame_size("Walk")
+            # Return the larger dimension (usually they're equal)
+            return max(size) if size else None
             
         except Exception as e:
             print(f"Error parsing AnimData.xml: {e}")
             return None
 
-    def _get_anim_size_by_name(self, anims_root, anim_name, visited=None):
-        """Recursively gets animation frame size by name, handling CopyOf references."""
-        if visited is None:
-            visited = set()
-        
-        if anim_name in visited:
-            return None
-        visited.add(anim_name)
-        
-        for anim in anims_root.findall("Anim"):
-            name_elem = anim.find("Name")
-            if name_elem is not None and name_elem.text == anim_name:
-                fw_elem = anim.find("FrameWidth")
-                fh_elem = anim.find("FrameHeight")
-                
-                if fw_elem is not None and fh_elem is not None:
-                    return max(int(fw_elem.text), int(fh_elem.text))
-                
-                copy_of = anim.find("CopyOf")
-                if copy_of is not None:
-                    return self._get_anim_size_by_name(anims_root, copy_of.text, visited)
-        
-        return None
-
     def start_sprite_generation_sequential(self):
         """Starts processing folders sequentially, skipping those with Sprites subfolder."""
         if self.update_breadcrumbs:
@@ -7,6 +7,8 @@ import pathlib
 import xml.etree.ElementTree as ET
 from collections import Counter
 from PIL import Image
+from core.anim_data import load_anim_data
+from core.animation_data_handler import get_optimized_sprite_folder
 
 class ESP32AssetExporter:
     def __init__(self, search_path):
@@ -23,14 +25,7 @@ class ESP32AssetExporter:
 
                 if os.path.isfile(anim_xml_path):
                     try:
-                        tree = ET.parse(anim_xml_path)
-                        root = tree.getroot()
-                        
-                        for anim_node in root.findall('.//Anims/Anim'):
-                            name_node = anim_node.find('Name')
-                            if name_node is not None and name_node.text:
-                                name = name_node.text.strip()
-                                self.animation_counts[name] += 1
+                        self.animation_counts.update(load_anim_data(anim_xml_path).names)
                     
                     except ET.ParseError as e:
                         print(f"    [ERROR] Could not parse XML file '{anim_xml_path}': {e}")
@@ -164,7 +159,7 @@ class ESP32AssetExporter:
                 with open(source_json_path, 'r') as f:
                     anim_data = json.load(f)
                 
-                source_anim_sprites_dir = char_folder / anim_name
+                source_anim_sprites_dir = pathlib.Path(get_optimized_sprite_folder(char_folder, anim_name, anim_data))
                 if not source_anim_sprites_dir.is_dir():
                     log_callback(f"  - WARNING: Sprite source folder '{source_anim_sprites_dir.name}' not found. Cannot copy sprites for this animation.")
                     continue
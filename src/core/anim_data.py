@@ -0,0 +1,125 @@
+# core/anim_data.py
+
+import os
+import threading
+import xml.etree.ElementTree as ET
+
+ANIM_DATA_FILENAME = "AnimData.xml"
+
+class AnimData:
+    """
+    Parsed model of a PMD Collab AnimData.xml. The file is parsed once and every
+    `CopyOf` chain is resolved up front, so all consumers share the same view of
+    frame sizes and durations. Use load_anim_data() to get a cached instance.
+    """
+    def __init__(self, path):
+        self.path = path
+        root = ET.parse(path).getroot()
+
+        shadow_tag = root.find("ShadowSize")
+        self.shadow_size = int(shadow_tag.text) if shadow_tag is not None and shadow_tag.text else None
+
+        # Raw, unresolved properties of every <Anim>, keyed by name in XML order
+        # (None for an animation with malformed numbers).
+        self.anims = {}
+        anims_root = root.find("Anims")
+        for anim_xml in (anims_root.findall("Anim") if anims_root is not None else []):
+            name_tag = anim_xml.find("Name")
+            if name_tag is None or not name_tag.text or not name_tag.text.strip():
+                continue
+            name = name_tag.text.strip()
+            try:
+                self.anims[name] = self._read_anim(anim_xml)
+            except ValueError as e:
+                # Keep the name listed, but resolve() treats the animation as missing.
+                print(f"Warning: Invalid value in animation '{name}' of {path}: {e}. Skipping.")
+                self.anims[name] = None
+
+        self._resolved = {name: self._resolve(name) for name in self.anims}
+
+    @staticmethod
+    def _read_anim(anim_xml):
+        copy_of_tag = anim_xml.find("CopyOf")
+        fw_tag = anim_xml.find("FrameWidth")
+        fh_tag = anim_xml.find("FrameHeight")
+        durations_tag = anim_xml.find("Durations")
+        return {
+            "copy_of": copy_of_tag.text.strip() if copy_of_tag is not None and copy_of_tag.text else None,
+            "frame_width": int(fw_tag.text) if fw_tag is not None and fw_tag.text else None,
+            "frame_height": int(fh_tag.text) if fh_tag is not None and fh_tag.text else None,
+            "durations": ([int(d.text) for d in durations_tag.findall("Duration") if d.text]
+                          if durations_tag is not None else None)
+        }
+
+    def _resolve(self, anim_name):
+        """Follows the `CopyOf` chain of an animation to the entry that owns its sheet, avoiding cycles."""
+        visited = set()
+        name = anim_name
+        while name not in visited:
+            visited.add(name)
+            anim = self.anims.get(name)
+            if anim is None:
+                return None
+            if anim["copy_of"]:
+                name = anim["copy_of"]
+                continue
+            return {
+                "source_name": name,
+                "frame_width": anim["frame_width"],
+                "frame_height": anim["frame_height"],
+                "durations": anim["durations"]
+            }
+        print(f"Warning: Circular dependency detected in CopyOf for animation '{anim_name}' in {self.path}.")
+        return None
+
+    @property
+    def names(self):
+        """Animation names in XML order, including `CopyOf` entries."""
+        return list(self.anims)
+
+    def resolve(self, anim_name):
+        """
+        Returns the resolved properties of an animation ("source_name", "frame_width",
+        "frame_height", "durations"), or None if it is missing or part of a `CopyOf` cycle.
+        """
+        resolved = self._resolved.get(anim_name)
+        if resolved is None:
+            return None
+        durations = resolved["durations"]
+        return {**resolved, "durations": list(durations) if durations is not None else None}
+
+    def frame_size(self, anim_name):
+        """Returns (frame_width, frame_height) of an animation, or None if unknown."""
+        resolved = self._resolved.get(anim_name)
+        if resolved is None or resolved["frame_width"] is None or resolved["frame_height"] is None:
+            return None
+        return resolved["frame_width"], resolved["frame_height"]
+
+    def durations(self, anim_name):
+        """Returns the per-frame durations (game ticks) of an animation, or None if absent."""
+        resolved = self._resolved.get(anim_name)
+        if resolved is None or not resolved["durations"]:
+            return None
+        return list(resolved["durations"])
+
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+def load_anim_data(path):
+    """
+    Returns the parsed AnimData model for an AnimData.xml path. Models are cached by
+    path and reparsed only when the file's mtime or size changes. Raises the same
+    errors as ET.parse (e.g. FileNotFoundError, ET.ParseError).
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+    model = AnimData(path)
+    with _cache_lock:
+        _cache[path] = (key, model)
+    return model
@@ -2,20 +2,55 @@
 
 import os
 import json
-import xml.etree.ElementTree as ET
-from PIL import Image, ImageOps
+from PIL import Image
 from core.sprite_sheet_handler import SpriteSheetHandler
-from core.sprite_matcher import SpriteMatcher
+from core.project_session import ProjectSession
+from core.anim_data import ANIM_DATA_FILENAME, load_anim_data
+from core.palette import Palette, find_recolor_sheet, read_recolor_palette
+from core.manifest import file_fingerprint, load_manifest, save_manifest
 from core import image_utils
 import shutil
 import math
-
-def calculate_isometric_render_data(corrected_frame_data, group_frames, group_shadow_frames, group_metadata):
+import hashlib
+import logging
+import numpy as np
+from core.log_utils import get_logger, timed
+
+logger = get_logger(__name__)
+
+# Shared sprite folder (inside AnimationData) used by the pooled export mode.
+SPRITE_POOL_FOLDER = "SpritePool"
+
+# Per-project record of the inputs every exported animation was generated from.
+GENERATION_MANIFEST_FILENAME = "animation_data_manifest.json"
+GENERATION_MANIFEST_VERSION = 3
+
+def get_optimized_sprite_folder(anim_data_folder, anim_name, anim_json):
+    """
+    Returns the folder holding the sprite PNGs referenced by an exported
+    `<anim_name>-AnimData.json`: the character's shared sprite pool for pooled
+    exports, otherwise the animation's own subfolder.
+    """
+    pool = anim_json.get("sprite_pool") if anim_json else None
+    return os.path.join(anim_data_folder, pool if pool else anim_name)
+
+def _pooled_sprite_files(anim_json):
+    """File names of the pooled sprites an exported JSON references (empty for non-pooled exports)."""
+    if not anim_json or not anim_json.get("sprite_pool"):
+        return set()
+    return {f"sprite_{content_id}.png" for content_id in anim_json.get("sprite_sources", {})}
+
+def _recorded_inputs(fingerprint):
+    """The inputs a pinned manifest entry is checked against: everything but the settings."""
+    return {key: value for key, value in fingerprint.items() if key not in ("settings", "pinned")}
+
+def calculate_isometric_render_data(corrected_frame_data, group_frames, group_shadow_frames, group_metadata, shadow_anchor_0=None):
     if not group_shadow_frames or not group_metadata:
         return None, [None] * len(group_frames)
 
     sprite_anchor_offset = None
-    shadow_anchor_0 = image_utils.find_white_pixel_anchor(group_shadow_frames[0])
+    if shadow_anchor_0 is None:
+        shadow_anchor_0 = image_utils.find_white_pixel_anchor(group_shadow_frames[0])
     offset_anchor_0 = group_metadata[0]['anchors'].get('green')
 
     if shadow_anchor_0 and offset_anchor_0:
@@ -29,6 +64,7 @@ def calculate_isometric_render_data(corrected_frame_data, group_frames, group_sh
         return sprite_anchor_offset, [None] * len(group_frames)
 
     render_offsets = []
+    trace = logger.isEnabledFor(logging.DEBUG)
     
     for i, frame_data in enumerate(corrected_frame_data):
         current_render_offset = None
@@ -55,17 +91,12 @@ def calculate_isometric_render_data(corrected_frame_data, group_frames, group_sh
 
             current_render_offset = (round(render_anchor_x_offset), round(render_anchor_y_offset))
             
-            total_move_x = frame_data["pos"][0] - ref_pos_corrected[0]
-            total_move_y = frame_data["pos"][1] - ref_pos_corrected[1]
-
-            print("-" * 50)
-            print(f"DEBUG: Render Offset Calculation (Frame {i})")
-            print(f"  - World Disp (for info): ({total_move_x:.2f}, {total_move_y:.2f})")
-            print(f"  - Sprite Anchor Offset: {sprite_anchor_offset}")
-            print(f"  - Ref Green Pos (Frame 0): {offset_anchor_0}")
-            print(f"  - Corrected Sprite Pos (current frame): {frame_data['pos']}")
-            print(f"  - FINAL Render Offset: {current_render_offset}")
-            print("-" * 50)
+            if trace:
+                logger.debug(
+                    "render offset frame=%d world_disp=(%.2f, %.2f) sprite_anchor_offset=%s "
+                    "ref_green=%s corrected_pos=%s render_offset=%s",
+                    i, frame_data["pos"][0] - ref_pos_corrected[0], frame_data["pos"][1] - ref_pos_corrected[1],
+                    sprite_anchor_offset, offset_anchor_0, frame_data["pos"], current_render_offset)
 
         render_offsets.append(current_render_offset)
     
@@ -73,83 +104,58 @@ def calculate_isometric_render_data(corrected_frame_data, group_frames, group_sh
 
 
 class AnimationDataHandler:
-    def __init__(self, project_path):
+    def __init__(self, project_path, match_tolerance=None, sprite_pool=False):
         self.project_path = project_path
+        # Pooled export: one deduplicated, content-addressed sprite folder per character.
+        self.sprite_pool = sprite_pool
         self.sprite_folder = os.path.join(project_path, "Sprites")
         self.animations_folder = os.path.join(project_path, "Animations")
+        # Matcher and decoded sprites shared by every animation of this project.
+        self.session = ProjectSession(self.sprite_folder, match_tolerance)
+        self._export_palette = None
         self.anim_data = self._load_anim_data()
 
+    def clear(self):
+        """
+        Drops everything built from the sprite library (matcher, placement bounds and the
+        export palette) so the next export reads the Sprites folder and recolor sheet again.
+        """
+        self.session.clear()
+        self._export_palette = None
+
     def _load_anim_data(self):
-        anim_data_path = os.path.join(self.animations_folder, "AnimData.xml")
+        anim_data_path = os.path.join(self.animations_folder, ANIM_DATA_FILENAME)
         if not os.path.exists(anim_data_path):
             print(f"Warning: XML file not found in: {self.animations_folder}")
             return []
-        tree = ET.parse(anim_data_path)
-        return self._process_xml(tree)
-
-    def _get_source_anim_info(self, anim_name, xml_anims_map, visited=None):
-        """Recursively finds the base properties and source name for an animation, avoiding cycles."""
-        if visited is None:
-            visited = set()
-        
-        if anim_name in visited:
-            print(f"Warning: Circular dependency detected in CopyOf for animation '{anim_name}'.")
-            return None
-        
-        if anim_name not in xml_anims_map:
-            return None
+        return self._process_xml(load_anim_data(anim_data_path))
 
-        visited.add(anim_name)
-        anim_xml = xml_anims_map[anim_name]
-        copy_of_tag = anim_xml.find('CopyOf')
-
-        if copy_of_tag is not None:
-            source_name = copy_of_tag.text
-            return self._get_source_anim_info(source_name, xml_anims_map, visited)
-
-        fw_tag = anim_xml.find("FrameWidth")
-        fh_tag = anim_xml.find("FrameHeight")
-        if fw_tag is not None and fh_tag is not None:
-            return {
-                "source_name": anim_name,
-                "properties": {
-                    "frame_width": int(fw_tag.text),
-                    "frame_height": int(fh_tag.text),
-                    "durations": [int(d.text) for d in anim_xml.findall("Durations/Duration")]
-                }
-            }
-        
-        return None
-
-    def _process_xml(self, tree):
+    def _process_xml(self, anim_data_model):
         animations = []
-        anims_root = tree.getroot().find("Anims")
-        if not anims_root: return []
 
-        xml_anims_map = {anim.find('Name').text: anim for anim in anims_root.findall('Anim')}
-        
-        for anim_name in xml_anims_map:
+        for anim_name in anim_data_model.names:
             try:
-                source_info = self._get_source_anim_info(anim_name, xml_anims_map)
+                source_info = anim_data_model.resolve(anim_name)
 
-                if source_info is None:
+                if source_info is None or source_info["frame_width"] is None or source_info["frame_height"] is None:
                     continue
                 
                 image_source_name = source_info["source_name"]
-                base_properties = source_info["properties"]
                 
                 anim_data = {
                     "name": anim_name,
-                    **base_properties,
+                    "frame_width": source_info["frame_width"],
+                    "frame_height": source_info["frame_height"],
+                    "durations": source_info["durations"] or [],
                     "image_path": os.path.join(self.animations_folder, f"{image_source_name}-Anim.png")
                 }
 
                 if not os.path.exists(anim_data["image_path"]):
                     continue
 
-                with Image.open(anim_data["image_path"]) as img:
-                    anim_data["total_groups"] = img.height // anim_data["frame_height"]
-                    anim_data["frames_per_group"] = img.width // anim_data["frame_width"]
+                img_width, img_height = image_utils.get_png_size(anim_data["image_path"])
+                anim_data["total_groups"] = img_height // anim_data["frame_height"]
+                anim_data["frames_per_group"] = img_width // anim_data["frame_width"]
 
                 animations.append(anim_data)
             except Exception as e:
@@ -157,9 +163,13 @@ class AnimationDataHandler:
         
         return animations
 
-    def _load_animation_assets(self, anim):
+    def _load_animation_assets(self, anim, as_views=False):
+        """
+        Loads the frames, offsets frames, shadow frames and per-frame metadata of an animation.
+        With as_views=True the frames are FrameView slices of each decoded sheet instead of PIL crops.
+        """
         handler = SpriteSheetHandler(anim["image_path"])
-        all_frames = handler.split_animation_frames(anim["frame_width"], anim["frame_height"])
+        all_frames = handler.split_animation_frames(anim["frame_width"], anim["frame_height"], as_views)
         
         all_offsets_frames = []
         all_shadow_frames = []
@@ -168,8 +178,8 @@ class AnimationDataHandler:
         offsets_image_path = anim["image_path"].replace("-Anim.png", "-Offsets.png")
         if os.path.exists(offsets_image_path):
             offsets_handler = SpriteSheetHandler(offsets_image_path)
-            all_offsets_frames = offsets_handler.split_animation_frames(anim["frame_width"], anim["frame_height"])
-            all_metadata = [self._get_frame_metadata(f) for f in all_offsets_frames]
+            all_offsets_frames = offsets_handler.split_animation_frames(anim["frame_width"], anim["frame_height"], as_views)
+            all_metadata = self._get_sheet_metadata(offsets_handler.get_array(), anim["frame_width"], anim["frame_height"])
         else:
             default_anchor = (anim["frame_width"] // 2, anim["frame_height"] // 2 - 1)
             num_frames = anim["total_groups"] * anim["frames_per_group"]
@@ -178,7 +188,7 @@ class AnimationDataHandler:
         shadow_image_path = anim["image_path"].replace("-Anim.png", "-Shadow.png")
         if os.path.exists(shadow_image_path):
             shadow_handler = SpriteSheetHandler(shadow_image_path)
-            all_shadow_frames = shadow_handler.split_animation_frames(anim["frame_width"], anim["frame_height"])
+            all_shadow_frames = shadow_handler.split_animation_frames(anim["frame_width"], anim["frame_height"], as_views)
             
             os.makedirs(self.sprite_folder, exist_ok=True)
             sprite_shadow_path = os.path.join(self.sprite_folder, "sprite_shadow.png")
@@ -188,7 +198,10 @@ class AnimationDataHandler:
                     if first_shadow_frame:
                         bbox = first_shadow_frame.getbbox()
                         base_sprite = first_shadow_frame.crop(bbox)
-                        base_sprite.save(sprite_shadow_path)
+                        # Written atomically: worker processes may extract it concurrently.
+                        tmp_path = f"{sprite_shadow_path}.{os.getpid()}.tmp"
+                        base_sprite.save(tmp_path, format='PNG')
+                        os.replace(tmp_path, sprite_shadow_path)
                         print(f"Saved base shadow sprite to {sprite_shadow_path}")
                 except Exception as e:
                     print(f"Could not extract and save base shadow sprite: {e}")
@@ -196,21 +209,47 @@ class AnimationDataHandler:
         return all_frames, all_offsets_frames, all_shadow_frames, all_metadata
 
     def _get_frame_metadata(self, frame_image):
-        if frame_image.mode != 'RGBA': frame_image = frame_image.convert('RGBA')
-        width, height = frame_image.size; pixels = frame_image.load()
+        width, height = frame_image.size
+        return self._get_sheet_metadata(frame_image, width, height)[0]
+
+    def _get_sheet_metadata(self, sheet_image, frame_width, frame_height):
+        """
+        Finds the anchor pixels of every frame of an -Offsets.png sheet in one NumPy pass.
+        Returns one metadata dict per frame, in the same order as split_animation_frames.
+        For each colour the last matching pixel in column-major order (x outer, y inner)
+        wins, and its y is shifted up by one. Accepts a PIL image or a decoded RGBA array.
+        """
+        if isinstance(sheet_image, np.ndarray):
+            pixels = sheet_image
+        else:
+            if sheet_image.mode != 'RGBA': sheet_image = sheet_image.convert('RGBA')
+            pixels = np.asarray(sheet_image)
+        sheet_h, sheet_w = pixels.shape[:2]
+        rows, cols = -(-sheet_h // frame_height), -(-sheet_w // frame_width)
+        # Pad partial edge frames with transparency, like Image.crop does.
+        if (rows * frame_height, cols * frame_width) != (sheet_h, sheet_w):
+            padded = np.zeros((rows * frame_height, cols * frame_width, 4), dtype=pixels.dtype)
+            padded[:sheet_h, :sheet_w] = pixels
+            pixels = padded
         # Anchor colors used for pixel-perfect positioning from the -Offsets.png file.
         # (Mouth) Black: #000000, (Right hand) Red: #FF0000, (Left hand) Green: #00FF00, (Body center) Blue: #0000FF
         anchor_colors = {"black": (0, 0, 0, 255), "red": (255, 0, 0, 255), "green": (0, 255, 0, 255), "blue": (0, 0, 255, 255)}
-        found_anchors = {color: None for color in anchor_colors}
-        for x in range(width):
-            for y in range(height):
-                for color_name, color_value in anchor_colors.items():
-                    if pixels[x, y] == color_value: found_anchors[color_name] = (x, y)
-        for color, coords in found_anchors.items():
-            if coords: found_anchors[color] = (coords[0], coords[1] - 1)
-        if found_anchors["black"] is None:
-            found_anchors["black"] = (width // 2, height // 2 - 1)
-        return {"anchors": found_anchors}
+        num_frames = rows * cols
+        frame_size = frame_width * frame_height
+        all_anchors = [{color: None for color in anchor_colors} for _ in range(num_frames)]
+        for color_name, color_value in anchor_colors.items():
+            mask = np.all(pixels == np.array(color_value, dtype=pixels.dtype), axis=-1)
+            # (rows, fh, cols, fw) -> (frame, x, y), flattened so the scan order is x outer, y inner.
+            mask = mask.reshape(rows, frame_height, cols, frame_width).transpose(0, 2, 3, 1).reshape(num_frames, frame_size)
+            found = mask.any(axis=1)
+            last = frame_size - 1 - np.argmax(mask[:, ::-1], axis=1)
+            for frame_idx in np.flatnonzero(found):
+                x, y = divmod(int(last[frame_idx]), frame_height)
+                all_anchors[frame_idx][color_name] = (x, y - 1)
+        for found_anchors in all_anchors:
+            if found_anchors["black"] is None:
+                found_anchors["black"] = (frame_width // 2, frame_height // 2 - 1)
+        return [{"anchors": found_anchors} for found_anchors in all_anchors]
 
     def _get_default_group_name(self, anim_name, total_groups, group_idx):
         DIRECTIONAL_NAMES_8 = ("down", "down-right", "right", "up-right", "up", "up-left", "left", "down-left")
@@ -226,30 +265,11 @@ class AnimationDataHandler:
             sprite_id = value_dict["id"]
             is_mirrored = value_dict["mirrored"]
             
-            sprite_to_paste = image_utils.load_sprite(self.sprite_folder, sprite_id, is_mirrored)
+            sprite_to_paste = self.session.load_sprite(sprite_id, is_mirrored)
             
             if sprite_to_paste:
-                all_anchors = group_metadata[i]['anchors']
-                sprite_center_target = all_anchors.get("green") or all_anchors.get("black")
-                anchor_x, anchor_y = sprite_center_target
-                
-                sprite_w, sprite_h = sprite_to_paste.size
-                initial_paste_x = anchor_x - sprite_w // 2
-                initial_paste_y = anchor_y - sprite_h // 2
-                
-                temp_frame = Image.new('RGBA', (frame_width, frame_height), (0, 0, 0, 0))
-                temp_frame.paste(sprite_to_paste, (initial_paste_x, initial_paste_y), sprite_to_paste)
-
-                center_orig = image_utils.get_image_bottom_center(original_frames[i])
-                center_temp = image_utils.get_image_bottom_center(temp_frame)
-
-                correction_x, correction_y = (0, 0)
-                if center_orig and center_temp:
-                    correction_x = center_orig[0] - center_temp[0]
-                    correction_y = center_orig[1] - center_temp[1]
-
-                final_paste_x = initial_paste_x + int(round(correction_x))
-                final_paste_y = initial_paste_y + int(round(correction_y))
+                final_paste_x, final_paste_y = self.session.placement.place(
+                    sprite_to_paste, group_metadata[i]['anchors'], (frame_width, frame_height), original_frames[i])
                 render_data.append({"image": sprite_to_paste, "pos": (final_paste_x, final_paste_y)})
             else:
                 render_data.append({"image": None, "pos": (0, 0)})
@@ -257,10 +277,13 @@ class AnimationDataHandler:
 
     def generate_animation_data(self, index):
         anim = self.anim_data[index]
-        all_frames, _, all_shadow_frames, all_metadata = self._load_animation_assets(anim)
+        all_frames, _, all_shadow_frames, all_metadata = self._load_animation_assets(anim, as_views=True)
         grouped_sprites = {}
         try:
-            matcher = SpriteMatcher(self.sprite_folder) if os.path.exists(self.sprite_folder) else None
+            matcher = self.session.matcher
+            # Match the whole sheet in one batch; repeated poses are only looked up once.
+            match_data = matcher.match_frames(all_frames) if matcher else None
+            shadow_anchors = image_utils.find_white_pixel_anchors(all_shadow_frames)
             for group_idx in range(anim["total_groups"]):
                 start, end = group_idx * anim["frames_per_group"], (group_idx + 1) * anim["frames_per_group"]
                 group_frames = all_frames[start:end]
@@ -268,9 +291,8 @@ class AnimationDataHandler:
                 group_metadata = all_metadata[start:end]
 
                 values = []
-                if matcher:
-                    match_data = matcher.match_group(group_frames)
-                    values = [{"id": sid, "mirrored": m} for sid, m in zip(match_data["frame_matches"], match_data["per_frame_mirror"])]
+                if match_data:
+                    values = [{"id": sid, "mirrored": m} for sid, m in zip(match_data["frame_matches"][start:end], match_data["per_frame_mirror"][start:end])]
                 else:
                     values = [{"id": 0, "mirrored": False}] * anim["frames_per_group"]
                 
@@ -292,7 +314,8 @@ class AnimationDataHandler:
                     min_x, min_y, max_x, max_y = 0, 0, anim["frame_width"], anim["frame_height"]
                 
                 _, render_offsets = calculate_isometric_render_data(
-                    render_data, group_frames, group_shadow_frames, group_metadata
+                    render_data, group_frames, group_shadow_frames, group_metadata,
+                    shadow_anchor_0=shadow_anchors[start] if start < len(shadow_anchors) else None
                 )
 
                 group_name = self._get_default_group_name(anim["name"], anim["total_groups"], group_idx)
@@ -309,7 +332,213 @@ class AnimationDataHandler:
             
         return {"index": index, "name": anim["name"], "sprites": grouped_sprites, "durations": anim["durations"]}
 
+    def _get_export_palette(self):
+        """
+        The character's shared export palette: the palette row of its sprite_recolor sheet
+        followed by any other colour used in the sprite library. False if the colours do
+        not fit in 256 entries.
+        """
+        if self._export_palette is None:
+            try:
+                recolor_sheet = find_recolor_sheet(self.project_path)
+                base_colors = read_recolor_palette(recolor_sheet) if recolor_sheet else []
+                sprites = [self.session.load_sprite(sprite_id, False) for sprite_id in sorted(self._list_library_sprites())]
+                self._export_palette = Palette.from_images([s for s in sprites if s], base_colors)
+            except Exception as e:
+                print(f"Warning: Could not build an exact palette for {self.project_path}: {e}. Using adaptive quantization.")
+                self._export_palette = False
+        return self._export_palette
+
+    def _to_indexed(self, img):
+        """Converts a sprite to an indexed image with the character palette (adaptive quantization as fallback)."""
+        palette = self._get_export_palette()
+        if palette:
+            try:
+                return palette.quantize(img)
+            except ValueError:
+                pass
+        return img.convert('P', palette=Image.ADAPTIVE, colors=256)
+
+    def _export_pooled_sprite(self, img, pool_folder):
+        """
+        Writes an indexed sprite into the shared pool under its content id, unless an
+        identical sprite is already there, and returns the id.
+        """
+        indexed = self._to_indexed(img)
+        digest = hashlib.blake2b(img.tobytes(), digest_size=8)
+        digest.update(f"{img.mode}:{img.width}x{img.height}".encode())
+        digest.update(bytes(indexed.getpalette(rawmode='RGBA') or b''))
+        content_id = f"c{digest.hexdigest()}"
+        sprite_path = os.path.join(pool_folder, f"sprite_{content_id}.png")
+        if not os.path.exists(sprite_path):
+            tmp_path = f"{sprite_path}.{os.getpid()}.tmp"
+            indexed.save(tmp_path, format='PNG')
+            os.replace(tmp_path, sprite_path)
+        return content_id
+
+    def _list_library_sprites(self):
+        """Returns {sprite id: file name} of every sprite_N.png in the Sprites folder."""
+        sprites = {}
+        if os.path.isdir(self.sprite_folder):
+            for file in os.listdir(self.sprite_folder):
+                lower = file.lower()
+                stem = lower[len("sprite_"):-len(".png")] if lower.startswith("sprite_") and lower.endswith(".png") else ""
+                if stem.isdigit():
+                    sprites[int(stem)] = file
+        return sprites
+
+    def get_sprites_fingerprint(self):
+        """
+        Digest of the current sprite library state (names, sizes and mtimes of every
+        sprite_N.png). Not cached: a long-lived handler must see later library edits.
+        """
+        entries = sorted([file, *file_fingerprint(os.path.join(self.sprite_folder, file))]
+                         for file in self._list_library_sprites().values())
+        return hashlib.blake2b(json.dumps(entries).encode(), digest_size=16).hexdigest()
+
+    def _get_recolor_sheet_fingerprint(self):
+        """[file name, mtime_ns, size] of the recolor sheet the export palette is built from, or None."""
+        recolor_sheet = find_recolor_sheet(self.project_path)
+        if recolor_sheet is None:
+            return None
+        return [os.path.basename(recolor_sheet), *(file_fingerprint(recolor_sheet) or [])]
+
+    def get_input_fingerprint(self, index, sprites_fingerprint=None):
+        """
+        Describes every input the exported animation depends on: AnimData.xml, its
+        -Anim/-Offsets/-Shadow sheets, the sprite library, the sprite_recolor sheet that
+        orders the export palette and the generation settings. Pass sprites_fingerprint
+        (see get_sprites_fingerprint) to reuse one library digest for several animations.
+        """
+        if sprites_fingerprint is None:
+            sprites_fingerprint = self.get_sprites_fingerprint()
+        anim = self.anim_data[index]
+        return {
+            "version": GENERATION_MANIFEST_VERSION,
+            "settings": {"match_tolerance": self.session.match_tolerance, "sprite_pool": self.sprite_pool},
+            "anim_data": file_fingerprint(os.path.join(self.animations_folder, ANIM_DATA_FILENAME)),
+            "sheets": {suffix: file_fingerprint(anim["image_path"].replace("-Anim.png", suffix))
+                       for suffix in ("-Anim.png", "-Offsets.png", "-Shadow.png")},
+            "sprites": sprites_fingerprint,
+            "recolor_sheet": self._get_recolor_sheet_fingerprint()
+        }
+
+    def get_manifest_path(self):
+        return os.path.join(self.project_path, GENERATION_MANIFEST_FILENAME)
+
+    def load_generation_manifest(self):
+        """Returns {animation name: input fingerprint} of the last generation, or {} if unavailable."""
+        return load_manifest(self.get_manifest_path(), GENERATION_MANIFEST_VERSION, "animations")
+
+    def save_generation_manifest(self, animations):
+        save_manifest(self.get_manifest_path(), GENERATION_MANIFEST_VERSION, "animations", animations)
+
+    def record_generation(self, anim_names):
+        """
+        Marks the current exports of these animations as made from the current inputs, so
+        later batch runs keep them (e.g. after saving hand edits in the AnimationViewer).
+        The entries are pinned: they stay current whatever matching or pool settings a
+        batch run uses, and only an input change makes them stale again.
+        """
+        anim_names = set(anim_names)
+        manifest = self.load_generation_manifest()
+        sprites_fingerprint = self.get_sprites_fingerprint()
+        for index, anim in enumerate(self.anim_data):
+            if anim["name"] in anim_names:
+                manifest[anim["name"]] = dict(self.get_input_fingerprint(index, sprites_fingerprint), pinned=True)
+        self.save_generation_manifest(manifest)
+
+    def is_export_up_to_date(self, index, fingerprint, manifest):
+        """
+        True if the animation was exported from exactly these inputs (ignoring the settings
+        for pinned entries, see record_generation) and its output is still on disk.
+        """
+        anim_name = self.anim_data[index]["name"]
+        recorded = manifest.get(anim_name)
+        if not isinstance(recorded, dict):
+            return False
+        if recorded.get("pinned"):
+            matches = _recorded_inputs(recorded) == _recorded_inputs(fingerprint)
+        else:
+            matches = recorded == fingerprint
+        return matches and self.has_export(anim_name)
+
+    def has_export(self, anim_name):
+        """
+        True if the animation's exported JSON and its sprite folder exist and, for pooled
+        exports, every pooled sprite the JSON references is still in the pool.
+        """
+        output_folder = os.path.join(self.project_path, "AnimationData")
+        json_path = os.path.join(output_folder, f"{anim_name}-AnimData.json")
+        try:
+            with open(json_path, 'r') as f:
+                exported = json.load(f)
+        except (OSError, ValueError):
+            return False
+        sprite_folder = get_optimized_sprite_folder(output_folder, anim_name, exported)
+        if not os.path.isdir(sprite_folder):
+            return False
+        return all(os.path.exists(os.path.join(sprite_folder, file)) for file in _pooled_sprite_files(exported))
+
+    def prune_sprite_pool(self):
+        """
+        Deletes pooled sprites that no exported JSON of the character references any more
+        (e.g. after library edits changed their content). Call it only once no export of
+        this project is running. Returns the number of files removed.
+        """
+        output_folder = os.path.join(self.project_path, "AnimationData")
+        pool_folder = os.path.join(output_folder, SPRITE_POOL_FOLDER)
+        if not os.path.isdir(pool_folder):
+            return 0
+        referenced = set()
+        for file in os.listdir(output_folder):
+            if not file.endswith("-AnimData.json"):
+                continue
+            try:
+                with open(os.path.join(output_folder, file), 'r') as f:
+                    referenced |= _pooled_sprite_files(json.load(f))
+            except (OSError, ValueError) as e:
+                # An unreadable JSON might reference anything; keep the pool as it is.
+                print(f"Warning: Not pruning {pool_folder}, could not read {file}: {e}")
+                return 0
+        removed = 0
+        for file in os.listdir(pool_folder):
+            if file.startswith("sprite_") and file.endswith(".png") and file not in referenced:
+                os.remove(os.path.join(pool_folder, file))
+                removed += 1
+        return removed
+
+    def plan_generation(self, force=False):
+        """
+        Splits the project's animations using the generation manifest. Returns
+        (current, stale): {animation name: input fingerprint} for animations whose export
+        is up to date, and for those that must be (re)generated. An existing export with no
+        manifest entry (made before manifests existed, or by hand) is adopted as current
+        rather than overwritten. force treats every animation as stale.
+        """
+        manifest = {} if force else self.load_generation_manifest()
+        current, stale = {}, {}
+        sprites_fingerprint = self.get_sprites_fingerprint()
+        for index, anim in enumerate(self.anim_data):
+            fingerprint = self.get_input_fingerprint(index, sprites_fingerprint)
+            if self.is_export_up_to_date(index, fingerprint, manifest):
+                # Keeps a pinned entry (and its pin) as recorded.
+                current[anim["name"]] = manifest[anim["name"]]
+            elif not force and anim["name"] not in manifest and self.has_export(anim["name"]):
+                current[anim["name"]] = fingerprint
+            else:
+                stale[anim["name"]] = fingerprint
+        return current, stale
+
     def export_optimized_animation(self, json_data):
+        """
+        Writes `<name>-AnimData.json` into AnimationData along with quantized copies of
+        every sprite it uses. By default the sprites go to a subfolder per animation and
+        are referenced by library name ("12", "12_mirrored"). With sprite_pool enabled
+        they are written once per character into AnimationData/SpritePool and
+        referenced by content id. The JSON then records "sprite_pool" and a
+        "sprite_sources" map from content id back to library name.
+        """
         if not json_data: return None, "No JSON data provided."
         try:
             base_folder_name = "AnimationData"
@@ -321,10 +550,18 @@ class AnimationDataHandler:
 
             if os.path.exists(sprites_subfolder):
                 shutil.rmtree(sprites_subfolder)
-            os.makedirs(sprites_subfolder)
+            if self.sprite_pool:
+                pool_folder = os.path.join(output_folder, SPRITE_POOL_FOLDER)
+                os.makedirs(pool_folder, exist_ok=True)
+            else:
+                os.makedirs(sprites_subfolder)
 
-            processed_sprites = set()
+            exported_ids = {}
+            sprite_sources = {}
             simplified_json = {k: json_data[k] for k in ["name", "durations"] if k in json_data}
+            if self.sprite_pool:
+                simplified_json['sprite_pool'] = SPRITE_POOL_FOLDER
+                simplified_json['sprite_sources'] = sprite_sources
             simplified_json['sprites'] = {}
             
             for group_id, group_data in json_data.get('sprites', {}).items():
@@ -355,18 +592,23 @@ class AnimationDataHandler:
 
                     final_sprite_name = f"{original_id}_mirrored" if is_mirrored else str(original_id)
                     
-                    if final_sprite_name not in processed_sprites:
+                    if final_sprite_name not in exported_ids:
                         try:
-                            source_path = os.path.join(self.sprite_folder, f"sprite_{original_id}.png")
-                            img = Image.open(source_path).convert('RGBA')
-                            if is_mirrored: img = ImageOps.mirror(img)
-                            img_8bit = img.convert('P', palette=Image.ADAPTIVE, colors=256)
-                            img_8bit.save(os.path.join(sprites_subfolder, f"sprite_{final_sprite_name}.png"))
-                            processed_sprites.add(final_sprite_name)
+                            img = self.session.load_sprite(original_id, is_mirrored)
+                            if img is None: raise FileNotFoundError(original_id)
+                            if self.sprite_pool:
+                                content_id = self._export_pooled_sprite(img, pool_folder)
+                                sprite_sources[content_id] = final_sprite_name
+                                exported_ids[final_sprite_name] = content_id
+                            else:
+                                img_8bit = self._to_indexed(img)
+                                img_8bit.save(os.path.join(sprites_subfolder, f"sprite_{final_sprite_name}.png"))
+                                exported_ids[final_sprite_name] = final_sprite_name
                         except FileNotFoundError: print(f"Warning: sprite_{original_id}.png not found.")
                         except Exception as e: print(f"Error processing sprite {original_id}: {e}")
                     
-                    simplified_group['frames'].append({"id": final_sprite_name, "render_offset": render_offset})
+                    frame_id = exported_ids.get(final_sprite_name, final_sprite_name)
+                    simplified_group['frames'].append({"id": frame_id, "render_offset": render_offset})
                 
                 simplified_json['sprites'][group_id] = simplified_group
 
@@ -375,4 +617,31 @@ class AnimationDataHandler:
                 json.dump(simplified_json, f, indent=4)
             return json_output_path, None
         except Exception as e:
-            return None, f"Failed to export animation '{json_data.get('name', 'Unknown')}': {e}"
\ No newline at end of file
+            return None, f"Failed to export animation '{json_data.get('name', 'Unknown')}': {e}"
+
+
+# Handler kept by export_animation_task between tasks of the same project in a worker process.
+_task_handler = None
+
+def export_animation_task(project_path, anim_name, match_tolerance=None, sprite_pool=False):
+    """
+    Generates and exports a single animation of a project. Takes only picklable
+    arguments so it can run in a worker process; the handler (and with it the
+    project's matcher) is reused by consecutive tasks for the same project.
+    Returns (anim_name, saved, error).
+    """
+    global _task_handler
+    key = (os.path.abspath(project_path), match_tolerance, sprite_pool)
+    if _task_handler is None or _task_handler[0] != key:
+        _task_handler = (key, AnimationDataHandler(project_path, match_tolerance=match_tolerance, sprite_pool=sprite_pool))
+    handler = _task_handler[1]
+
+    index = next((i for i, anim in enumerate(handler.anim_data) if anim["name"] == anim_name), None)
+    if index is None:
+        return anim_name, False, f"Animation '{anim_name}' not found in AnimData.xml."
+    with timed(logger, f"{os.path.basename(project_path)}/{anim_name}"):
+        json_data = handler.generate_animation_data(index)
+        if not json_data:
+            return anim_name, False, None
+        _, error = handler.export_optimized_animation(json_data)
+    return anim_name, error is None, error
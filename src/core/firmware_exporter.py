@@ -38,17 +38,23 @@ Because the layout is fully data-driven, both consumers read each creature's
 `<id>.json` and use the per-direction walk/idle cells + durations straight from
 the JSON -- no packing knowledge is hard-coded in the web editor or the firmware.
 
-The module is GUI-agnostic (only depends on Pillow + the std library) so it can be
-reused from a CLI script and from the Tkinter app.
+The module is GUI-agnostic (only depends on Pillow, NumPy + the std library) so it
+can be reused from a CLI script and from the Tkinter app.
 """
 
+import concurrent.futures
+import filecmp
 import json
+import multiprocessing
 import os
 import shutil
-import xml.etree.ElementTree as ET
 
+import numpy as np
 from PIL import Image
 
+from core.anim_data import load_anim_data
+from core.manifest import file_fingerprint, load_manifest, save_manifest
+
 # --- PMD sprite-sheet direction rows -----------------------------------------
 # PMD `-Anim.png` sheets store one direction per row, counter-clockwise starting
 # from South (Down). Edit these if a future asset set uses a different order.
@@ -139,6 +145,14 @@ PMD_TICK_MS = 33
 # real PMD walk/idle tick durations).
 DIR_ROWS = [("down", 0), ("left", 1), ("right", 2), ("up", 3)]
 
+# --- Incremental export ------------------------------------------------------
+# `export_all` records, per creature, the inputs its sheet was converted from
+# (AnimData.xml + the Walk/Idle/Sleep sheets, by mtime and size) and the export
+# parameters. A rerun only reconverts creatures whose entry changed or whose
+# outputs went missing (staging then skips the files that are already identical).
+MANIFEST_FILE = "firmware_manifest.json"
+MANIFEST_VERSION = 1
+
 
 def build_layout_dict(cols, rows=SLEEP_ROW + 1, frames=DEFAULT_FRAMES,
                       idle_frames=DEFAULT_IDLE_FRAMES,
@@ -255,68 +269,28 @@ TARGET_RELPATHS = {
     "web": "local-content/projects/default/shared/services/pet/assets/graphics/species/pokemon",
 }
 
+# How `_stage_target` mirrors the flat output into each target tree. "hardlink"
+# (default), "symlink" and "reflink" (copy-on-write clone, Linux FICLONE) avoid
+# storing the sheets three times; any of them falls back to "copy" when the
+# filesystem does not support it. Files whose staged copy is already identical
+# are never rewritten.
+STAGE_MODES = ("hardlink", "symlink", "reflink", "copy")
+DEFAULT_STAGE_MODE = "hardlink"
+_FICLONE = 0x40049409
+
 
 def _parse_anim_frame_size(animdata_path, anim_name="Walk"):
     """Return (frame_width, frame_height) for an animation, resolving <CopyOf>."""
-    tree = ET.parse(animdata_path)
-    root = tree.getroot()
-
-    anims = {}
-    for anim in root.iter("Anim"):
-        name_el = anim.find("Name")
-        if name_el is None:
-            continue
-        anims[name_el.text] = anim
-
-    seen = set()
-    name = anim_name
-    while name and name not in seen:
-        seen.add(name)
-        anim = anims.get(name)
-        if anim is None:
-            return None
-        copy_of = anim.find("CopyOf")
-        if copy_of is not None and copy_of.text:
-            name = copy_of.text
-            continue
-        fw = anim.find("FrameWidth")
-        fh = anim.find("FrameHeight")
-        if fw is None or fh is None:
-            return None
-        return int(fw.text), int(fh.text)
-    return None
+    return load_anim_data(animdata_path).frame_size(anim_name)
 
 
 def _parse_anim_durations(animdata_path, anim_name):
     """Return the per-frame duration list (game ticks) for an animation,
     resolving `<CopyOf>`. Returns None when the animation/durations are absent."""
     try:
-        root = ET.parse(animdata_path).getroot()
+        return load_anim_data(animdata_path).durations(anim_name)
     except Exception:
         return None
-    anims = {}
-    for anim in root.iter("Anim"):
-        name_el = anim.find("Name")
-        if name_el is not None and name_el.text:
-            anims[name_el.text] = anim
-
-    seen = set()
-    name = anim_name
-    while name and name not in seen:
-        seen.add(name)
-        anim = anims.get(name)
-        if anim is None:
-            return None
-        copy_of = anim.find("CopyOf")
-        if copy_of is not None and copy_of.text:
-            name = copy_of.text
-            continue
-        durs = anim.find("Durations")
-        if durs is None:
-            return None
-        out = [int(d.text) for d in durs.findall("Duration") if d.text]
-        return out or None
-    return None
 
 
 def _column_durations_ticks(native_durs, n, fallback_ticks=4):
@@ -332,42 +306,47 @@ def _column_durations_ticks(native_durs, n, fallback_ticks=4):
             for i in range(n)]
 
 
-def _prepare_frame(frame, crop_box, scale=DEFAULT_SCALE):
+def _cell_grid(sheet, fw, fh):
     """
-    Crop `frame` to `crop_box` and magnify it by `scale` (integer, nearest-neighbour
-    for crisp pixel-art). Returns the resulting image.
-
-    `crop_box` is the creature's shared content bounding box (union over all of its
-    frames, in native frame coordinates), so every frame is cropped to the SAME box
-    and therefore comes out the SAME pixel size -- which is exactly the per-species
-    cell size used to tile the output sheet. Because the crop is a single fixed box
-    per creature, frames keep their positions relative to each other, preserving the
-    walk bounce / jumps. Nothing is centered or padded: the cell IS the content box,
-    so no creature is clipped and there is no dead margin around it. `crop_box` may
-    be None (fully transparent creature), in which case the native frame is used
-    as-is.
+    Decode a PMD `-Anim.png` sheet into a `(rows, fh, cols, fw, 4)` RGBA array, one
+    `fw` x `fh` frame per (dir_row, frame_col). Partial trailing frames are dropped
+    and a sheet smaller than one frame is padded with transparent pixels, exactly
+    like cropping each frame out of the sheet.
     """
-    if crop_box is not None:
-        frame = frame.crop(crop_box)
-    if scale != 1:
-        fw, fh = frame.size
-        frame = frame.resize((max(1, fw * scale), max(1, fh * scale)), Image.NEAREST)
-    return frame
-
-
-def _union_bbox(frames):
-    """Union of the non-transparent bounding boxes of `frames` (or None if empty)."""
-    union = None
-    for fr in frames:
-        bb = fr.getbbox()
-        if bb is None:
-            continue
-        if union is None:
-            union = bb
-        else:
-            union = (min(union[0], bb[0]), min(union[1], bb[1]),
-                     max(union[2], bb[2]), max(union[3], bb[3]))
-    return union
+    px = np.asarray(sheet.convert("RGBA"))
+    sh, sw = px.shape[:2]
+    cols = max(1, sw // fw)
+    rows = max(1, sh // fh)
+    px = px[:rows * fh, :cols * fw]
+    if px.shape[:2] != (rows * fh, cols * fw):
+        px = np.pad(px, ((0, rows * fh - px.shape[0]), (0, cols * fw - px.shape[1]), (0, 0)))
+    return px.reshape(rows, fh, cols, fw, 4)
+
+
+def _select_cells(cells, dir_rows, frame_cols):
+    """
+    The frames at every (dir_row, frame_col) pair of a `_cell_grid`, as a
+    `(len(dir_rows), fh, len(frame_cols), fw, 4)` block. Out-of-range rows and
+    columns are clamped to the last one of the sheet.
+    """
+    rows, cols = cells.shape[0], cells.shape[2]
+    dir_rows = np.minimum(np.asarray(list(dir_rows), dtype=np.intp), rows - 1)
+    frame_cols = np.minimum(np.asarray(list(frame_cols), dtype=np.intp), cols - 1)
+    return cells[dir_rows][:, :, frame_cols]
+
+
+def _grid_union_bbox(block):
+    """
+    Union of the non-transparent bounding boxes of every frame of a `_select_cells`
+    block, in frame coordinates (or None if they are all empty). Same result as
+    `getbbox()` on each cropped frame, from two alpha projections.
+    """
+    alpha = block[..., 3]
+    ys = np.flatnonzero(alpha.any(axis=(0, 2, 3)))
+    if not len(ys):
+        return None
+    xs = np.flatnonzero(alpha.any(axis=(0, 1, 2)))
+    return int(xs[0]), int(ys[0]), int(xs[-1]) + 1, int(ys[-1]) + 1
 
 
 def _resample_indices(native_count, target_count):
@@ -386,33 +365,42 @@ def _resample_indices(native_count, target_count):
             for i in range(target_count)]
 
 
-def _paste_anchored(out, frame, cell_x, cell_y, cell_w, cell_h):
+def _composite_block(out, block, crop_box, out_row, cell_w, cell_h, scale=DEFAULT_SCALE):
     """
-    Paste `frame` into the cell at (cell_x, cell_y) of size (cell_w, cell_h),
-    horizontally centered and bottom-anchored. Anchoring the feet to the cell
-    bottom keeps the walk and idle blocks aligned even when their content boxes
-    differ in size (the idle animation often has a slightly different footprint
-    than walk), and matches how the firmware bottom-anchors the cell to the tile
-    floor.
+    Write a `_select_cells` block into the output sheet array `out` (cells of
+    `cell_w` x `cell_h`), its first row at sheet row `out_row` and its first column
+    at column 0.
+
+    Every frame is cropped to the block's shared content box `crop_box` (union over
+    all of its frames), so the frames keep their positions relative to each other,
+    preserving the walk bounce / jumps, and all come out the same size. They are
+    magnified by `scale` (integer, nearest-neighbour for crisp pixel-art), then
+    horizontally centered and bottom-anchored in their cell. Anchoring the feet to
+    the cell bottom keeps the walk, idle and sleep blocks aligned even when their
+    content boxes differ in size, and matches how the firmware bottom-anchors the
+    cell to the tile floor.
+
+    The pixels match `out.paste(frame, pos, frame)` onto the empty sheet: Pillow
+    scales every channel, alpha included, by alpha / 255 (rounded). A block
+    without content (`crop_box` None) would paste nothing and is skipped.
     """
-    fw, fh = frame.size
-    px = cell_x + (cell_w - fw) // 2
-    py = cell_y + (cell_h - fh)
-    out.paste(frame, (px, py), frame)
-
-
-def _crop_grid(sheet, fw, fh):
-    """Return a `crop(dir_row, frame_col)` closure over a PMD `-Anim.png` sheet."""
-    sw, sh = sheet.size
-    cols = max(1, sw // fw)
-    rows = max(1, sh // fh)
-
-    def crop(dir_row, frame_col):
-        r = min(dir_row, rows - 1)
-        c = min(frame_col, cols - 1)
-        return sheet.crop((c * fw, r * fh, (c + 1) * fw, (r + 1) * fh))
-
-    return crop, cols, rows
+    if crop_box is None:
+        return
+    x0, y0, x1, y1 = crop_box
+    block = block[:, y0:y1, :, x0:x1]
+    # Blend at native resolution: scaling only repeats pixels, so it commutes.
+    blended = block.astype(np.uint16) * block[..., 3:4]
+    blended += 128
+    blended += blended >> 8
+    blended >>= 8
+    block = blended.astype(np.uint8)
+    if scale != 1:
+        block = block.repeat(scale, axis=1).repeat(scale, axis=3)
+    n_rows, fh, n_cols, fw = block.shape[:4]
+    px = (cell_w - fw) // 2
+    py = cell_h - fh
+    grid = out.reshape(out.shape[0] // cell_h, cell_h, out.shape[1] // cell_w, cell_w, 4)
+    grid[out_row:out_row + n_rows, py:py + fh, :n_cols, px:px + fw] = block
 
 
 def export_project(project_path, output_png, frames=DEFAULT_FRAMES,
@@ -447,22 +435,17 @@ def export_project(project_path, output_png, frames=DEFAULT_FRAMES,
     if not size:
         raise ValueError("Walk frame size not found in AnimData.xml")
     wfw, wfh = size
-    walk_img = Image.open(walk_sheet).convert("RGBA")
-    walk_crop, walk_cols, _ = _crop_grid(walk_img, wfw, wfh)
+    walk_cells = _cell_grid(Image.open(walk_sheet), wfw, wfh)
 
     # Keep this creature's native walk cycle as-is (no resampling), capped so it
     # never exceeds the firmware's per-direction walk-frame limit.
-    walk_n = min(walk_cols, frames)
-    src_cols = list(range(walk_n))
-
-    # (out_row, out_col, native_frame, crop_box) tuples for every placed cell. The
-    # crop box (per animation) is applied later so the walk and idle blocks are
-    # each cropped to their own union footprint, then bottom-anchored into a shared
-    # per-species cell.
-    walk_placed = [(out_row, out_col, walk_crop(pmd_row, src_col))
-                   for out_row, pmd_row in enumerate(OUT_ROW_SOURCE)
-                   for out_col, src_col in enumerate(src_cols)]
-    walk_box = _union_bbox(fr for _, _, fr in walk_placed)
+    walk_n = min(walk_cells.shape[2], frames)
+
+    # Each block holds one row per output direction and one column per native
+    # frame. It is cropped to its own union footprint later, then bottom-anchored
+    # into a shared per-species cell.
+    walk_block = _select_cells(walk_cells, OUT_ROW_SOURCE, range(walk_n))
+    walk_box = _grid_union_bbox(walk_block)
 
     # Idle block (rows IDLE_ROW_BASE..+3). Keep the creature's native Idle
     # animation frame-for-frame when present; otherwise a single static idle cell
@@ -471,21 +454,16 @@ def export_project(project_path, output_png, frames=DEFAULT_FRAMES,
     idle_size = _parse_anim_frame_size(animdata, "Idle") if os.path.exists(idle_path) else None
     if idle_size:
         ifw, ifh = idle_size
-        idle_img = Image.open(idle_path).convert("RGBA")
-        idle_crop, idle_cols, _ = _crop_grid(idle_img, ifw, ifh)
-        idle_n = min(idle_cols, idle_frames)
-        idle_src = list(range(idle_n))
-        idle_placed = [(IDLE_ROW_BASE + out_row, out_col, idle_crop(pmd_row, isrc))
-                       for out_row, pmd_row in enumerate(OUT_ROW_SOURCE)
-                       for out_col, isrc in enumerate(idle_src)]
+        idle_cells = _cell_grid(Image.open(idle_path), ifw, ifh)
+        idle_n = min(idle_cells.shape[2], idle_frames)
+        idle_block = _select_cells(idle_cells, OUT_ROW_SOURCE, range(idle_n))
         idle_ticks = _column_durations_ticks(_parse_anim_durations(animdata, "Idle"), idle_n)
     else:
         # Static fallback: a single idle cell = walk frame 0.
         idle_n = 1
-        idle_placed = [(IDLE_ROW_BASE + out_row, 0, walk_crop(pmd_row, 0))
-                       for out_row, pmd_row in enumerate(OUT_ROW_SOURCE)]
+        idle_block = _select_cells(walk_cells, OUT_ROW_SOURCE, [0])
         idle_ticks = [max(1, round(DEFAULT_IDLE_FRAME_MS / PMD_TICK_MS))]
-    idle_box = _union_bbox(fr for _, _, fr in idle_placed)
+    idle_box = _grid_union_bbox(idle_block)
 
     # Sleep block: a single NON-directional row (SLEEP_ROW). PMD authors `Sleep`
     # as one row (the creature lies down in one pose regardless of facing), so
@@ -495,17 +473,16 @@ def export_project(project_path, output_png, frames=DEFAULT_FRAMES,
     sleep_size = _parse_anim_frame_size(animdata, "Sleep") if os.path.exists(sleep_path) else None
     if sleep_size:
         sfw, sfh = sleep_size
-        sleep_img = Image.open(sleep_path).convert("RGBA")
-        sleep_crop, sleep_cols, _ = _crop_grid(sleep_img, sfw, sfh)
-        sleep_n = min(sleep_cols, DEFAULT_SLEEP_FRAMES)
-        sleep_placed = [(SLEEP_ROW, out_col, sleep_crop(0, ssrc))
-                        for out_col, ssrc in enumerate(range(sleep_n))]
+        sleep_cells = _cell_grid(Image.open(sleep_path), sfw, sfh)
+        sleep_n = min(sleep_cells.shape[2], DEFAULT_SLEEP_FRAMES)
+        sleep_block = _select_cells(sleep_cells, [0], range(sleep_n))
+        sleep_box = _grid_union_bbox(sleep_block)
         sleep_ticks = _column_durations_ticks(_parse_anim_durations(animdata, "Sleep"), sleep_n)
     else:
         sleep_n = 0
-        sleep_placed = []
+        sleep_block = None
+        sleep_box = None
         sleep_ticks = None
-    sleep_box = _union_bbox(fr for _, _, fr in sleep_placed)
 
     # Real per-frame cadence in PMD ticks for the web preview / device (1:1 with
     # the native frames).
@@ -525,20 +502,15 @@ def export_project(project_path, output_png, frames=DEFAULT_FRAMES,
 
     out_cols = max(walk_n, idle_n, sleep_n)
     out_rows = (SLEEP_ROW + 1) if sleep_n > 0 else (IDLE_ROW_BASE + 4)
-    out = Image.new("RGBA", (cell_w * out_cols, cell_h * out_rows), (0, 0, 0, 0))
-
-    for out_row, out_col, raw in walk_placed:
-        frame = _prepare_frame(raw, walk_box, scale)
-        _paste_anchored(out, frame, out_col * cell_w, out_row * cell_h, cell_w, cell_h)
-    for out_row, out_col, raw in idle_placed:
-        frame = _prepare_frame(raw, idle_box, scale)
-        _paste_anchored(out, frame, out_col * cell_w, out_row * cell_h, cell_w, cell_h)
-    for out_row, out_col, raw in sleep_placed:
-        frame = _prepare_frame(raw, sleep_box, scale)
-        _paste_anchored(out, frame, out_col * cell_w, out_row * cell_h, cell_w, cell_h)
+    # The whole sheet is composited into one preallocated array and encoded once.
+    out = np.zeros((cell_h * out_rows, cell_w * out_cols, 4), dtype=np.uint8)
+    _composite_block(out, walk_block, walk_box, 0, cell_w, cell_h, scale)
+    _composite_block(out, idle_block, idle_box, IDLE_ROW_BASE, cell_w, cell_h, scale)
+    if sleep_block is not None:
+        _composite_block(out, sleep_block, sleep_box, SLEEP_ROW, cell_w, cell_h, scale)
 
     os.makedirs(os.path.dirname(output_png), exist_ok=True)
-    out.save(output_png)
+    Image.fromarray(out, "RGBA").save(output_png)
     layout = build_layout_dict(out_cols, rows=out_rows, frames=walk_n,
                                idle_frames=idle_n,
                                idle_frame_ms=DEFAULT_IDLE_FRAME_MS,
@@ -554,7 +526,7 @@ def export_project(project_path, output_png, frames=DEFAULT_FRAMES,
     return output_png, layout
 
 
-def _output_name(folder_name):
+def output_name(folder_name):
     """'0001 Bulbasaur' -> '001'. Falls back to a sanitized folder name."""
     token = folder_name.split(" ", 1)[0]
     try:
@@ -563,30 +535,94 @@ def _output_name(folder_name):
         return folder_name.replace(" ", "_")
 
 
-def _stage_target(base_dir, sheets, target, log):
+def _export_project_task(project_path, output_png, frames, scale, idle_frames):
+    """
+    Picklable wrapper around export_project for the process pool: returns
+    `(True, None)` or `(False, message)` instead of raising.
+    """
+    try:
+        export_project(project_path, output_png, frames, scale, idle_frames)
+        return True, None
+    except Exception as e:
+        return False, str(e)
+
+
+def _project_fingerprint(project_path, frames, scale, idle_frames):
+    """Everything `export_project` reads for one creature, plus the export parameters."""
+    animations = os.path.join(project_path, "Animations")
+    return {
+        "settings": {"frames": frames, "scale": scale, "idle_frames": idle_frames},
+        "inputs": {name: file_fingerprint(os.path.join(animations, name))
+                   for name in (ANIM_DATA_FILE, WALK_ANIM_FILE, IDLE_ANIM_FILE, SLEEP_ANIM_FILE)},
+    }
+
+
+def _reflink(src, dst):
+    """Copy-on-write clone of `src` (raises OSError where unsupported)."""
+    try:
+        import fcntl
+    except ImportError:
+        raise OSError("reflinks are not supported on this platform")
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+    shutil.copystat(src, dst)
+
+
+def _place_file(src, dst, mode):
+    """Creates `dst` from `src` with the given stage mode, replacing any existing file atomically."""
+    tmp = f"{dst}.{os.getpid()}.tmp"
+    try:
+        if mode == "hardlink":
+            os.link(src, tmp)
+        elif mode == "symlink":
+            os.symlink(os.path.relpath(src, os.path.dirname(dst)), tmp)
+        elif mode == "reflink":
+            _reflink(src, tmp)
+        else:
+            shutil.copy2(src, tmp)
+        os.replace(tmp, dst)
+    finally:
+        if os.path.lexists(tmp):
+            os.remove(tmp)
+
+
+def _stage_target(base_dir, sheets, target, log, mode=DEFAULT_STAGE_MODE):
     """
     Mirror the generated sheets + their per-creature `<id>.json` data files under
     `<base_dir>/<target>/<relpath>` so the tree can be copied straight into the
-    matching repository root.
+    matching repository root. Files are linked or copied according to `mode` (see
+    STAGE_MODES); staged files that are already identical are left untouched.
+    Returns the mode actually used, "copy" after a fallback.
     """
     relpath = TARGET_RELPATHS.get(target)
     if not relpath:
         log(f"  WARN unknown target '{target}', skipped")
-        return
+        return mode
     dest = os.path.join(base_dir, target, *relpath.split("/"))
     os.makedirs(dest, exist_ok=True)
     for png in sheets:
-        shutil.copy2(png, os.path.join(dest, os.path.basename(png)))
         data = os.path.splitext(png)[0] + ".json"
-        if os.path.exists(data):
-            shutil.copy2(data, os.path.join(dest, os.path.basename(data)))
+        for src in (png, data) if os.path.exists(data) else (png,):
+            dst = os.path.join(dest, os.path.basename(src))
+            if os.path.exists(dst) and filecmp.cmp(src, dst, shallow=True):
+                continue
+            try:
+                _place_file(src, dst, mode)
+            except OSError as e:
+                if mode == "copy":
+                    raise
+                log(f"  WARN {mode} staging not available ({e}); copying instead")
+                mode = "copy"
+                _place_file(src, dst, mode)
     log(f"  target '{target}' -> {os.path.join(base_dir, target)}"
         f"  (copy its contents into the repo root: {relpath}/)")
+    return mode
 
 
 def export_all(downloads_dir, output_dir, log=print,
                targets=("firmware", "web"), frames=DEFAULT_FRAMES,
-               scale=DEFAULT_SCALE, idle_frames=DEFAULT_IDLE_FRAMES):
+               scale=DEFAULT_SCALE, idle_frames=DEFAULT_IDLE_FRAMES, workers=1,
+               force=False, stage=DEFAULT_STAGE_MODE):
     """
     Convert every project subfolder of `downloads_dir` into `output_dir`.
 
@@ -600,31 +636,70 @@ def export_all(downloads_dir, output_dir, log=print,
     `<output_dir>/<target>/<repo-relative-path>/` so it can be dropped straight into
     the corresponding repository. Pass `targets=()` for the flat output only.
 
+    With `workers` > 1 the creatures are converted in that many worker processes.
+    The sheets are identical and progress is still logged in sorted folder order.
+
+    Creatures whose inputs and parameters match `<output_dir>/firmware_manifest.json`
+    (and whose sheet + data file still exist) are neither reconverted nor restaged;
+    `force=True` reconverts everything.
+
+    `stage` picks how the target trees are populated (one of STAGE_MODES; linking by
+    default, with a fallback to plain copies).
+
     Returns (success_count, fail_count). `log` is called with progress strings.
     """
     os.makedirs(output_dir, exist_ok=True)
     ok = fail = 0
     folders = sorted(d for d in os.listdir(downloads_dir)
                      if os.path.isdir(os.path.join(downloads_dir, d)))
-    generated = []
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+    manifest = {} if force else load_manifest(manifest_path, MANIFEST_VERSION, "creatures")
+    fingerprints = {folder: _project_fingerprint(os.path.join(downloads_dir, folder), frames, scale, idle_frames)
+                    for folder in folders}
+    current = {}
+    folders_to_export = []
     for folder in folders:
-        project = os.path.join(downloads_dir, folder)
-        name = _output_name(folder)
-        out_png = os.path.join(output_dir, name + ".png")
-        try:
-            export_project(project, out_png, frames, scale, idle_frames)
-            ok += 1
-            generated.append(out_png)
-            log(f"  OK  {folder} -> {os.path.basename(out_png)}")
-        except Exception as e:
-            fail += 1
-            log(f"  SKIP {folder}: {e}")
+        out_png = os.path.join(output_dir, output_name(folder) + ".png")
+        if (manifest.get(folder) == fingerprints[folder] and os.path.exists(out_png)
+                and os.path.exists(os.path.splitext(out_png)[0] + ".json")):
+            current[folder] = fingerprints[folder]
+        else:
+            folders_to_export.append(folder)
+    unchanged = len(current)
+
+    jobs = [(os.path.join(downloads_dir, folder), os.path.join(output_dir, output_name(folder) + ".png"),
+             frames, scale, idle_frames) for folder in folders_to_export]
+    executor = None
+    if workers > 1 and len(jobs) > 1:
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=min(workers, len(jobs)), mp_context=multiprocessing.get_context("spawn"))
+    try:
+        # Executor.map yields in submission order, so the log stays sorted.
+        results = (executor.map(_export_project_task, *zip(*jobs)) if executor
+                   else (_export_project_task(*job) for job in jobs))
+        for folder, job, (success, error) in zip(folders_to_export, jobs, results):
+            out_png = job[1]
+            if success:
+                ok += 1
+                current[folder] = fingerprints[folder]
+                log(f"  OK  {folder} -> {os.path.basename(out_png)}")
+            else:
+                fail += 1
+                log(f"  SKIP {folder}: {error}")
+    finally:
+        if executor:
+            executor.shutdown()
+        save_manifest(manifest_path, MANIFEST_VERSION, "creatures", current)
+    ok += unchanged
+    generated = [os.path.join(output_dir, output_name(folder) + ".png") for folder in folders if folder in current]
+    if unchanged:
+        log(f"  {unchanged} unchanged creature(s) skipped")
 
     # Stage copy-ready trees for each requested target (web / firmware).
     if generated and targets:
         log("")
         for target in targets:
-            _stage_target(output_dir, generated, target, log)
+            stage = _stage_target(output_dir, generated, target, log, mode=stage)
 
     log(f"\nDone. Success: {ok}, Failed: {fail}")
     return ok, fail
@@ -1,7 +1,32 @@
 # ui_components/image_utils.py
 import os
+import struct
+import functools
+import threading
+from collections import OrderedDict
+import numpy as np
 from PIL import Image, ImageDraw, ImageOps
 
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+def get_png_size(path):
+    """
+    Returns (width, height) of an image by reading only the PNG IHDR chunk, without
+    decoding pixels. Results are cached per path and modification time. Non-PNG files
+    fall back to PIL.
+    """
+    stat = os.stat(path)
+    return _probe_image_size(path, stat.st_mtime_ns, stat.st_size)
+
+@functools.lru_cache(maxsize=4096)
+def _probe_image_size(path, mtime_ns, file_size):
+    with open(path, 'rb') as f:
+        header = f.read(24)
+    if len(header) == 24 and header[:8] == PNG_SIGNATURE and header[12:16] == b'IHDR':
+        return struct.unpack('>II', header[16:24])
+    with Image.open(path) as img:
+        return img.size
+
 def get_image_bottom_center(image):
     """Calculates the bottom-center of the visible pixels in an image."""
     bbox = image.getbbox()
@@ -14,19 +39,32 @@ def get_image_center(image):
 
 def find_white_pixel_anchor(image):
     """Finds the first white pixel (255, 255, 255, 255) as an anchor."""
-    if image.mode != 'RGBA':
-        image = image.convert('RGBA')
-    
-    width, height = image.size
-    pixels = image.load()
-    white_pixel_color = (255, 255, 255, 255)
-    
-    for y in range(height):
-        for x in range(width):
-            if pixels[x, y] == white_pixel_color:
-                return (x, y)
-    
-    return get_image_center(image)
+    return find_white_pixel_anchors([image])[0]
+
+def find_white_pixel_anchors(frames):
+    """
+    Batch version of find_white_pixel_anchor for equally sized frames, e.g. every
+    frame of a -Shadow.png sheet. Returns one anchor per frame: the first white pixel
+    in row-major order, or the frame's get_image_center when it has none.
+    """
+    if not frames:
+        return []
+    frames = [f if f.mode == 'RGBA' else f.convert('RGBA') for f in frames]
+    pixels = np.stack([np.asarray(f) for f in frames])
+    num_frames, height, width = pixels.shape[:3]
+
+    white = np.all(pixels == 255, axis=-1).reshape(num_frames, height * width)
+    found = white.any(axis=1)
+    first = np.argmax(white, axis=1)
+
+    anchors = []
+    for i, frame in enumerate(frames):
+        if found[i]:
+            y, x = divmod(int(first[i]), width)
+            anchors.append((x, y))
+        else:
+            anchors.append(get_image_center(frame))
+    return anchors
 
 def tint_image(image, color):
     """Tints an image with a specified color."""
@@ -36,16 +74,92 @@ def tint_image(image, color):
     tint_layer = Image.new('RGBA', image.size, color)
     return Image.composite(tint_layer, image, image)
 
+# Upper bound for the decoded library sprites kept by load_sprite (RGBA bytes).
+SPRITE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+class _SpriteCache:
+    """Thread-safe LRU of decoded sprites, bounded by their decoded size in bytes."""
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            image = self._entries.get(key)
+            if image is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return image
+
+    def put(self, key, image):
+        size = image.width * image.height * len(image.getbands())
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.width * previous.height * len(previous.getbands())
+            self._entries[key] = image
+            self._bytes += size
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.width * evicted.height * len(evicted.getbands())
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries),
+                    "bytes": self._bytes, "max_bytes": self.max_bytes}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = 0
+
+_sprite_cache = _SpriteCache(SPRITE_CACHE_MAX_BYTES)
+
 def load_sprite(sprite_folder, sprite_id, is_mirrored):
-    """Loads a single sprite by ID from a folder, with optional mirroring."""
+    """
+    Loads a single sprite by ID from a folder, with optional mirroring. Decoded and
+    mirrored sprites are kept in a process-wide LRU keyed by (folder, id, mirrored,
+    mtime), so an edited file is reloaded. The returned image is shared and must not
+    be modified in place.
+    """
     if not sprite_id or sprite_id <= 0: return None
+    path = os.path.join(sprite_folder, f"sprite_{sprite_id}.png")
     try:
-        path = os.path.join(sprite_folder, f"sprite_{sprite_id}.png")
-        sprite = Image.open(path).convert('RGBA')
-        return ImageOps.mirror(sprite) if is_mirrored else sprite
+        mtime_ns = os.stat(path).st_mtime_ns
     except FileNotFoundError:
         return None
 
+    key = (os.path.abspath(sprite_folder), sprite_id, bool(is_mirrored), mtime_ns)
+    sprite = _sprite_cache.get(key)
+    if sprite is None:
+        try:
+            if is_mirrored:
+                base = load_sprite(sprite_folder, sprite_id, False)
+                if base is None: return None
+                sprite = ImageOps.mirror(base)
+            else:
+                with Image.open(path) as img:
+                    sprite = img.convert('RGBA')
+        except FileNotFoundError:
+            return None
+        _sprite_cache.put(key, sprite)
+    return sprite
+
+def get_sprite_cache_stats():
+    """Returns the load_sprite cache counters: hits, misses, entries, bytes and max_bytes."""
+    return _sprite_cache.stats()
+
+def clear_sprite_cache():
+    """Drops every cached sprite and resets the counters."""
+    _sprite_cache.clear()
+
 def load_base_shadow_sprite(project_folder, anim_folder=None, is_2x=False):
     """
     Loads the base shadow sprite, searching in multiple common locations.
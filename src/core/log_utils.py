@@ -0,0 +1,93 @@
+# core/log_utils.py
+
+import contextlib
+import logging
+import os
+import time
+
+ROOT_LOGGER = "core"
+# Read at import, so worker processes pick up the same configuration as their parent.
+LOG_LEVEL_ENV = "PMD_LOG_LEVEL"
+TRACE_FILE_ENV = "PMD_TRACE_FILE"
+LOG_FORMAT = "%(asctime)s %(processName)s %(name)s %(levelname)s: %(message)s"
+
+_root = logging.getLogger(ROOT_LOGGER)
+_root.addHandler(logging.NullHandler())
+_root.setLevel(logging.WARNING)
+_root.propagate = False
+# The console handler installed by configure; a later call replaces it.
+_console_handler = None
+
+def get_logger(name):
+    """
+    Returns the named logger of a core module, e.g. get_logger(__name__) -> 'core.placement'.
+    Debug records are disabled by default; check logger.isEnabledFor(logging.DEBUG)
+    before building expensive messages so disabled tracing costs almost nothing.
+    """
+    return logging.getLogger(name if name == ROOT_LOGGER or name.startswith(ROOT_LOGGER + ".")
+                             else f"{ROOT_LOGGER}.{name}")
+
+def _add_handler(handler, level):
+    handler.setLevel(level)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    _root.addHandler(handler)
+    _root.setLevel(min(_root.level, handler.level))
+    return handler
+
+def configure(level=logging.INFO, stream=None):
+    """
+    Writes core log records at `level` and above to a stream (stderr by default). Calling
+    it again (e.g. a CLI flag after PMD_LOG_LEVEL was applied at import) replaces the
+    previous console handler instead of adding a second one. Returns the handler.
+    """
+    global _console_handler
+    if _console_handler is not None:
+        disable_trace(_console_handler)
+    _console_handler = _add_handler(logging.StreamHandler(stream), level)
+    return _console_handler
+
+def enable_trace(path, level=logging.DEBUG):
+    """
+    Appends core log records at `level` and above, including the per-frame render
+    traces, to a file. A trace already writing to the same file is replaced. Returns the
+    handler (pass it to disable_trace).
+    """
+    for handler in list(_root.handlers):
+        if isinstance(handler, logging.FileHandler) and handler.baseFilename == os.path.abspath(path):
+            disable_trace(handler)
+    return _add_handler(logging.FileHandler(path, encoding="utf-8"), level)
+
+def disable_trace(handler):
+    """Removes a handler added by configure or enable_trace and restores the level gate."""
+    global _console_handler
+    if handler is _console_handler:
+        _console_handler = None
+    _root.removeHandler(handler)
+    handler.close()
+    levels = [h.level for h in _root.handlers if not isinstance(h, logging.NullHandler)]
+    _root.setLevel(min(levels + [logging.WARNING]))
+
+def configure_from_env():
+    """Applies PMD_LOG_LEVEL (console, e.g. DEBUG) and PMD_TRACE_FILE (file trace) if set."""
+    level_name = os.environ.get(LOG_LEVEL_ENV)
+    if level_name:
+        level = logging.getLevelName(level_name.upper())
+        if isinstance(level, int):
+            configure(level)
+    trace_path = os.environ.get(TRACE_FILE_ENV)
+    if trace_path:
+        enable_trace(trace_path)
+
+@contextlib.contextmanager
+def timed(logger, what, level=logging.DEBUG):
+    """Logs how long the block took, only if `level` is enabled for the logger."""
+    if not logger.isEnabledFor(level):
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        logger.log(level, "%s took %.1f ms", what, (time.perf_counter() - start) * 1000)
+
+configure_from_env()
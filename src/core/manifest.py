@@ -0,0 +1,33 @@
+# core/manifest.py
+
+import json
+import os
+
+def file_fingerprint(path):
+    """[mtime_ns, size] of a file, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+def load_manifest(path, version, key):
+    """
+    Returns the `key` section of a versioned JSON manifest, or {} if the file is missing,
+    unreadable or was written with another version.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get("version") == version:
+            return manifest.get(key, {})
+    except (OSError, ValueError, AttributeError):
+        pass
+    return {}
+
+def save_manifest(path, version, key, entries):
+    """Writes {"version": version, key: entries} atomically (temp file + os.replace)."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"version": version, key: entries}, f, indent=4, sort_keys=True)
+    os.replace(tmp_path, path)
@@ -0,0 +1,131 @@
+# core/palette.py
+
+import os
+import numpy as np
+from PIL import Image
+
+TRANSPARENT = (0, 0, 0, 0)
+MAX_PALETTE_COLORS = 256
+RECOLOR_SHEET_PREFIX = "sprite_recolor"
+
+# Projects already warned about having several recolor sheets (one warning per process).
+_ambiguous_sheets_reported = set()
+
+def find_recolor_sheet(project_path):
+    """
+    Returns the path of the project's sprite_recolor-*.png master sheet, or None. If there
+    are several, the first in sorted order is used and a warning names it.
+    """
+    try:
+        names = sorted(f for f in os.listdir(project_path)
+                       if f.lower().startswith(RECOLOR_SHEET_PREFIX) and f.lower().endswith(".png"))
+    except FileNotFoundError:
+        return None
+    if len(names) > 1 and (project_path, tuple(names)) not in _ambiguous_sheets_reported:
+        _ambiguous_sheets_reported.add((project_path, tuple(names)))
+        print(f"Warning: {len(names)} recolor sheets in {project_path}; using {names[0]} "
+              f"(ignoring {', '.join(names[1:])}).")
+    return os.path.join(project_path, names[0]) if names else None
+
+def read_recolor_palette(path):
+    """
+    Reads the palette row of a sprite_recolor sheet: the distinct opaque colours of its
+    first row, in order of appearance.
+    """
+    with Image.open(path) as img:
+        row = np.asarray(img.convert('RGBA'))[0]
+    colors = []
+    for color in map(tuple, row.tolist()):
+        if color[3] and color not in colors:
+            colors.append(color)
+    return colors
+
+def _pack(pixels):
+    """Packs (..., 4) uint8 RGBA pixels into uint32 keys; fully transparent pixels all map to 0."""
+    pixels = np.ascontiguousarray(pixels, dtype=np.uint8)
+    keys = pixels.view(np.uint32)[..., 0]
+    return np.where(pixels[..., 3] == 0, np.uint32(0), keys)
+
+class Palette:
+    """
+    Exact RGBA palette for writing lossless indexed PNGs. Index 0 is transparent; every
+    other colour keeps its own alpha, which is written to the PNG tRNS chunk.
+    """
+    def __init__(self, colors):
+        colors = [TRANSPARENT] + [tuple(c) for c in colors if tuple(c) != TRANSPARENT and c[3]]
+        colors = list(dict.fromkeys(colors))
+        if len(colors) > MAX_PALETTE_COLORS:
+            raise ValueError(f"{len(colors)} colours do not fit in an indexed PNG.")
+        self.colors = colors
+        keys = _pack(np.array(colors, dtype=np.uint8))
+        order = np.argsort(keys)
+        self._sorted_keys = keys[order]
+        self._sorted_indices = order.astype(np.uint8)
+        self._flat = [channel for color in colors for channel in color]
+
+    @classmethod
+    def from_images(cls, images, base_colors=()):
+        """
+        Builds a palette that covers every colour of the images: the base colours first (e.g.
+        a recolor sheet's palette row), then any other colour found, in sorted order.
+        """
+        extra = set()
+        for image in images:
+            rgba = image if image.mode == 'RGBA' else image.convert('RGBA')
+            extra.update(np.unique(_pack(np.asarray(rgba))).tolist())
+        known = set(_pack(np.array(base_colors, dtype=np.uint8).reshape(-1, 4)).tolist())
+        extra = np.array(sorted(extra - known - {0}), dtype=np.uint32)
+        extra_colors = [tuple(c) for c in extra.reshape(-1, 1).view(np.uint8).reshape(-1, 4).tolist()]
+        return cls(list(base_colors) + extra_colors)
+
+    def quantize(self, image):
+        """
+        Maps an RGBA image onto the palette with a lookup, without any colour reduction.
+        Raises ValueError if the image uses a colour that is not in the palette.
+        """
+        rgba = image if image.mode == 'RGBA' else image.convert('RGBA')
+        keys = _pack(np.asarray(rgba))
+        positions = np.minimum(np.searchsorted(self._sorted_keys, keys), len(self._sorted_keys) - 1)
+        if not np.array_equal(self._sorted_keys[positions], keys):
+            raise ValueError("Image uses colours outside the palette.")
+        indexed = Image.fromarray(self._sorted_indices[positions], 'P')
+        indexed.putpalette(self._flat, rawmode='RGBA')
+        return indexed
+
+def build_color_map(base_colors, variant_colors):
+    """
+    Pairs two recolor palette rows position by position: {base RGB: variant RGB}. Rows of
+    different length are paired up to the shorter one.
+    """
+    if len(base_colors) != len(variant_colors):
+        print(f"Warning: Palette rows differ in length ({len(base_colors)} vs {len(variant_colors)}); "
+              f"only the first {min(len(base_colors), len(variant_colors))} colours are remapped.")
+    return {tuple(base[:3]): tuple(variant[:3]) for base, variant in zip(base_colors, variant_colors)}
+
+def recolor_indexed(image, color_map):
+    """Palette swap of an indexed image: only the palette entries are remapped, pixels and tRNS are kept."""
+    rgb = image.getpalette() or []
+    remapped = []
+    for i in range(0, len(rgb), 3):
+        remapped.extend(color_map.get(tuple(rgb[i:i + 3]), rgb[i:i + 3]))
+    recolored = image.copy()
+    recolored.putpalette(remapped)
+    return recolored
+
+def remap_colors(image, color_map):
+    """Recolours the visible pixels of an RGBA image whose RGB is in color_map (one vectorized lookup)."""
+    pixels = np.array(image if image.mode == 'RGBA' else image.convert('RGBA'))
+    if not color_map:
+        return Image.fromarray(pixels, 'RGBA')
+    src = np.array(list(color_map.keys()), dtype=np.uint32)
+    dst = np.array(list(color_map.values()), dtype=np.uint8)
+    src_keys = (src[:, 0] << 16) | (src[:, 1] << 8) | src[:, 2]
+    order = np.argsort(src_keys)
+    src_keys, dst = src_keys[order], dst[order]
+
+    rgb = pixels[..., :3].astype(np.uint32)
+    keys = (rgb[..., 0] << 16) | (rgb[..., 1] << 8) | rgb[..., 2]
+    positions = np.minimum(np.searchsorted(src_keys, keys), len(src_keys) - 1)
+    hit = (src_keys[positions] == keys) & (pixels[..., 3] > 0)
+    pixels[..., :3][hit] = dst[positions[hit]]
+    return Image.fromarray(pixels, 'RGBA')
@@ -5,6 +5,7 @@ from PIL import Image, ImageDraw
 import math
 from core import isometric_renderer, image_utils
 from core.animation_data_handler import calculate_isometric_render_data
+from core.placement import PlacementEngine
 
 class PreviewGenerator:
     def __init__(self, anim_data, group_frames, group_metadata, group_shadow_frames, sprite_folder, anim_folder):
@@ -15,6 +16,7 @@ class PreviewGenerator:
         self.sprite_folder = sprite_folder
         self.anim_folder = anim_folder
         self.base_sprite_img = image_utils.load_base_shadow_sprite(self.anim_folder)
+        self.placement = PlacementEngine()
 
     def get_generated_frame_data(self, sprite_ids, mirror_flags, apply_correction):
         result_data = []
@@ -24,26 +26,9 @@ class PreviewGenerator:
             sprite_to_paste = image_utils.load_sprite(self.sprite_folder, num, mirror_flags[i])
             
             if sprite_to_paste:
-                all_anchors = self.group_metadata[i]['anchors']
-                target = all_anchors.get("green") or all_anchors.get("black")
-                anchor_x, anchor_y = target
-                
-                sprite_w, sprite_h = sprite_to_paste.size
-                initial_x = anchor_x - sprite_w // 2
-                initial_y = anchor_y - sprite_h // 2
-                
-                final_x, final_y = initial_x, initial_y
-                
-                if apply_correction:
-                    temp = Image.new('RGBA', (frame_width, frame_height))
-                    temp.paste(sprite_to_paste, (initial_x, initial_y), sprite_to_paste)
-
-                    orig_center = image_utils.get_image_bottom_center(self.group_frames[i])
-                    temp_center = image_utils.get_image_bottom_center(temp)
-                    
-                    if orig_center and temp_center:
-                        final_x += int(round(orig_center[0] - temp_center[0]))
-                        final_y += int(round(orig_center[1] - temp_center[1]))
+                final_x, final_y = self.placement.place(
+                    sprite_to_paste, self.group_metadata[i]['anchors'], (frame_width, frame_height),
+                    self.group_frames[i] if apply_correction else None)
                 
                 result_data.append({"image": sprite_to_paste, "pos": (final_x, final_y)})
             else:
@@ -0,0 +1,38 @@
+# core/project_session.py
+
+import os
+from core.sprite_matcher import SpriteMatcher
+from core import image_utils
+from core.placement import PlacementEngine
+
+class ProjectSession:
+    """
+    Per-project state shared by every animation processed for one project folder:
+    a single SpriteMatcher and the placement engine that positions library sprites.
+    `match_tolerance` enables the matcher's tolerant (near-exact) mode.
+    """
+    def __init__(self, sprite_folder, match_tolerance=None):
+        self.sprite_folder = sprite_folder
+        self.match_tolerance = match_tolerance
+        self._matcher = None
+        self.placement = PlacementEngine()
+
+    @property
+    def matcher(self):
+        """The project's SpriteMatcher, built on first use (None if there is no Sprites folder)."""
+        if self._matcher is None and os.path.exists(self.sprite_folder):
+            self._matcher = SpriteMatcher(self.sprite_folder, tolerance=self.match_tolerance)
+        return self._matcher
+
+    def load_sprite(self, sprite_id, is_mirrored):
+        """
+        Returns the decoded RGBA library sprite (optionally mirrored) from the
+        process-wide image_utils sprite cache. The returned image is shared and must
+        not be modified in place.
+        """
+        return image_utils.load_sprite(self.sprite_folder, sprite_id, is_mirrored)
+
+    def clear(self):
+        """Drops the matcher and cached sprite bounds, e.g. after the Sprites folder was edited."""
+        self._matcher = None
+        self.placement = PlacementEngine()
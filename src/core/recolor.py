@@ -0,0 +1,63 @@
+# core/recolor.py
+
+import os
+import shutil
+from PIL import Image
+from core.palette import find_recolor_sheet, read_recolor_palette, build_color_map, recolor_indexed, remap_colors
+
+ANIMATION_DATA_FOLDER = "AnimationData"
+
+def load_variant_color_map(project_path, variant_sheet):
+    """
+    Maps the project's palette (first row of its sprite_recolor sheet) onto the palette
+    row of another recolor sheet, e.g. a shiny or alternate-colour one.
+    Raises ValueError if the project has no recolor sheet.
+    """
+    base_sheet = find_recolor_sheet(project_path)
+    if not base_sheet:
+        raise ValueError(f"No sprite_recolor sheet found in {project_path}")
+    return build_color_map(read_recolor_palette(base_sheet), read_recolor_palette(variant_sheet))
+
+def get_variant_folder(project_path, variant_name):
+    return os.path.join(project_path, f"{ANIMATION_DATA_FOLDER}-{variant_name}")
+
+def export_animation_variant(project_path, color_map, variant_name, log=print):
+    """
+    Writes a recoloured copy of the project's exported AnimationData into
+    `AnimationData-<variant_name>`. JSON files are copied unchanged. Indexed sprites only
+    get their palette entries remapped; others are recoloured pixel by pixel.
+    Returns (output_folder, sprite_count).
+    """
+    source = os.path.join(project_path, ANIMATION_DATA_FOLDER)
+    if not os.path.isdir(source):
+        raise ValueError(f"No {ANIMATION_DATA_FOLDER} folder in {project_path}; generate the animations first.")
+    output = get_variant_folder(project_path, variant_name)
+    if os.path.exists(output):
+        shutil.rmtree(output)
+
+    count = 0
+    for root, _, files in os.walk(source):
+        dest_root = os.path.join(output, os.path.relpath(root, source))
+        os.makedirs(dest_root, exist_ok=True)
+        for file in files:
+            src_path, dest_path = os.path.join(root, file), os.path.join(dest_root, file)
+            if not file.lower().endswith(".png"):
+                shutil.copy2(src_path, dest_path)
+                continue
+            with Image.open(src_path) as img:
+                recolored = recolor_indexed(img, color_map) if img.mode == 'P' else remap_colors(img, color_map)
+                recolored.save(dest_path)
+            count += 1
+    log(f"  {variant_name}: recoloured {count} sprites -> {output}")
+    return output, count
+
+def export_firmware_variant(sheet_png, output_png, color_map):
+    """Recolours an exported firmware/web sheet and copies its `<id>.json` next to it."""
+    with Image.open(sheet_png) as img:
+        recolored = recolor_indexed(img, color_map) if img.mode == 'P' else remap_colors(img, color_map)
+    os.makedirs(os.path.dirname(output_png), exist_ok=True)
+    recolored.save(output_png)
+    data = os.path.splitext(sheet_png)[0] + ".json"
+    if os.path.exists(data):
+        shutil.copy2(data, os.path.splitext(output_png)[0] + ".json")
+    return output_png
@@ -2,18 +2,77 @@
 
 from PIL import Image
 import os
+import json
+import hashlib
 import numpy as np
 
+# Persistent library cache, written next to the Sprites folder (i.e. in the project folder).
+LIBRARY_CACHE_FILENAME = "sprite_library_cache.npz"
+LIBRARY_CACHE_VERSION = 1
+
+# Suggested threshold for tolerant matching: mean absolute RGBA difference per channel (0-255).
+DEFAULT_MATCH_TOLERANCE = 4.0
+# Side of the average-hash grid used by the optional perceptual prefilter (8 -> 64-bit hash).
+PHASH_SIZE = 8
+
 class SpriteMatcher:
-    def __init__(self, edited_sprites_folder):
+    def __init__(self, edited_sprites_folder, use_cache=True, tolerance=None, phash_max_distance=None):
         """
         Initializes the matcher by loading and preprocessing all available library sprites.
+
+        When `use_cache` is True the cropped arrays and their digests are read from (and
+        saved to) a persistent `.npz` cache in the project folder. The cache is keyed by
+        the names, sizes and mtimes of the sprite files, so any edit to the Sprites
+        folder invalidates it.
+
+        `tolerance` opts into near-exact matching: frames without an exact match are
+        compared against every same-sized library sprite (direct and mirrored) and the
+        closest one is accepted if its mean absolute RGBA difference is at most
+        `tolerance` (see DEFAULT_MATCH_TOLERANCE). `phash_max_distance` additionally
+        discards candidates whose average hash differs in more bits than that.
         """
+        self.tolerance = tolerance
+        self.phash_max_distance = phash_max_distance
+        # Size groups for tolerant matching, built on first use: shape -> (names, mirror flags, stack, hashes).
+        self._size_groups = None
         self.processed_sprites = []
+        # Content-hash index: (shape, digest) -> [(name, array, is_mirrored), ...] in library order.
+        # Every sprite is indexed twice: as-is and horizontally flipped.
+        self._sprite_index = {}
+        # Match results of frames already seen by this matcher: frame digest -> (filename, is_mirrored).
+        self._frame_results = {}
         
         if not os.path.exists(edited_sprites_folder):
             raise FileNotFoundError(f"Sprites folder not found at: {edited_sprites_folder}")
 
+        sprite_files = self._list_sprite_files(edited_sprites_folder)
+        cache_path = self.get_cache_path(edited_sprites_folder)
+        signature = self._folder_signature(edited_sprites_folder, sprite_files)
+
+        if use_cache and self._load_cache(cache_path, signature):
+            return
+        
+        for file in sprite_files:
+            path = os.path.join(edited_sprites_folder, file)
+            img = Image.open(path).convert('RGBA')
+            processed_sprite_array = self._preprocess_sprite(img)
+            
+            if processed_sprite_array is not None:
+                self.processed_sprites.append((file, processed_sprite_array))
+                self._index_sprite(file, processed_sprite_array)
+
+        if use_cache:
+            self._save_cache(cache_path, signature)
+
+    @staticmethod
+    def get_cache_path(edited_sprites_folder):
+        """Returns the path of the persistent library cache for a Sprites folder."""
+        project_folder = os.path.dirname(os.path.abspath(edited_sprites_folder))
+        return os.path.join(project_folder, LIBRARY_CACHE_FILENAME)
+
+    @staticmethod
+    def _list_sprite_files(edited_sprites_folder):
+        """Returns the 'sprite_NUMBER.png' files of a folder, sorted by their number."""
         # Filter for files that strictly match the 'sprite_NUMBER.png' pattern before sorting
         valid_sprite_files = []
         for f in os.listdir(edited_sprites_folder):
@@ -25,18 +84,101 @@ class SpriteMatcher:
                 except (ValueError, IndexError):
                     continue # Skip files like 'sprite_shadow.png'
 
-        sprite_files = sorted(
+        return sorted(
             valid_sprite_files,
             key=lambda x: int(x.split('_')[-1].split('.')[0])
         )
-        
+
+    @staticmethod
+    def _folder_signature(edited_sprites_folder, sprite_files):
+        """Describes the Sprites folder state (names, sizes, mtimes) the cache is valid for."""
+        entries = []
         for file in sprite_files:
-            path = os.path.join(edited_sprites_folder, file)
-            img = Image.open(path).convert('RGBA')
-            processed_sprite_array = self._preprocess_sprite(img)
-            
-            if processed_sprite_array is not None:
-                self.processed_sprites.append((file, processed_sprite_array))
+            stat = os.stat(os.path.join(edited_sprites_folder, file))
+            entries.append([file, stat.st_size, stat.st_mtime_ns])
+        return json.dumps({
+            "version": LIBRARY_CACHE_VERSION,
+            "folder": os.path.basename(os.path.normpath(edited_sprites_folder)),
+            "files": entries
+        })
+
+    def _load_cache(self, cache_path, signature):
+        """
+        Rebuilds the library and its index from the persistent cache.
+        Returns False if the cache is missing, unreadable or stale.
+        """
+        if not os.path.exists(cache_path):
+            return False
+        try:
+            with np.load(cache_path, allow_pickle=False) as cache:
+                if str(cache["signature"]) != signature:
+                    return False
+                names = [str(n) for n in cache["names"]]
+                shapes = cache["shapes"]
+                offsets = cache["offsets"]
+                digests = cache["digests"]
+                pixels = cache["pixels"]
+        except Exception as e:
+            print(f"Warning: Ignoring unreadable sprite library cache {cache_path}: {e}")
+            return False
+
+        for i, name in enumerate(names):
+            shape = tuple(int(v) for v in shapes[i])
+            sprite_array = pixels[offsets[i]:offsets[i + 1]].reshape(shape)
+            self.processed_sprites.append((name, sprite_array))
+            self._index_sprite(name, sprite_array, keys=(
+                (shape, digests[i, 0].tobytes()),
+                (shape, digests[i, 1].tobytes())
+            ))
+        return True
+
+    def _save_cache(self, cache_path, signature):
+        """Writes the cropped library arrays and their digests to the persistent cache."""
+        names = [name for name, _ in self.processed_sprites]
+        arrays = [sprite_array for _, sprite_array in self.processed_sprites]
+        offsets = np.zeros(len(arrays) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([a.size for a in arrays])
+        digests = np.zeros((len(arrays), 2, 16), dtype=np.uint8)
+        for i, sprite_array in enumerate(arrays):
+            digests[i, 0] = np.frombuffer(self._content_key(sprite_array)[1], dtype=np.uint8)
+            digests[i, 1] = np.frombuffer(self._content_key(np.fliplr(sprite_array))[1], dtype=np.uint8)
+
+        # Unique per process: several worker processes may build the same project's cache.
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, 'wb') as f:
+                np.savez(
+                    f,
+                    signature=np.array(signature),
+                    names=np.array(names, dtype=str),
+                    shapes=np.array([a.shape for a in arrays], dtype=np.int32).reshape(-1, 3),
+                    offsets=offsets,
+                    digests=digests,
+                    pixels=np.concatenate([a.ravel() for a in arrays]) if arrays else np.zeros(0, dtype=np.uint8)
+                )
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            print(f"Warning: Could not write sprite library cache {cache_path}: {e}")
+
+    def _index_sprite(self, name, sprite_array, keys=None):
+        """
+        Adds a library sprite and its horizontally flipped variant to the content-hash index.
+        `keys` can pass precomputed (direct, mirrored) index keys, e.g. from the library cache.
+        """
+        mirrored_array = np.fliplr(sprite_array)
+        if keys is None:
+            keys = (self._content_key(sprite_array), self._content_key(mirrored_array))
+        direct_key, mirrored_key = keys
+        self._sprite_index.setdefault(direct_key, []).append((name, sprite_array, False))
+        self._sprite_index.setdefault(mirrored_key, []).append((name, mirrored_array, True))
+
+    @staticmethod
+    def _content_key(sprite_array):
+        """
+        Builds the lookup key for a cropped sprite array: its shape plus a digest of its RGBA bytes.
+        """
+        digest = hashlib.blake2b(np.ascontiguousarray(sprite_array).tobytes(), digest_size=16).digest()
+        return sprite_array.shape, digest
     
     def _preprocess_sprite(self, image):
         """
@@ -49,44 +191,123 @@ class SpriteMatcher:
     
     def _find_match(self, target_array):
         """
-        Compares a target sprite array against the entire library of processed sprites.
+        Looks up a target sprite array in the content-hash index of library sprites.
+        Candidates sharing the hash are confirmed byte-for-byte, so a digest collision
+        can never produce a false match. A direct match always wins over a mirrored one.
+
+        Returns:
+            A (filename, is_mirrored) tuple, or (None, False) if nothing matches.
         """
         if target_array is None:
-            return None
-            
-        for name, lib_sprite_array in self.processed_sprites:
-            if target_array.shape == lib_sprite_array.shape and np.array_equal(target_array, lib_sprite_array):
-                return name
-        return None
+            return None, False
 
-    def match_group(self, group_frames):
+        mirrored_match = None
+        for name, lib_sprite_array, is_mirrored in self._sprite_index.get(self._content_key(target_array), ()):
+            if not np.array_equal(target_array, lib_sprite_array):
+                continue
+            if not is_mirrored:
+                return name, False
+            if mirrored_match is None:
+                mirrored_match = name
+
+        if mirrored_match:
+            return mirrored_match, True
+        return None, False
+
+    def _build_size_groups(self):
+        """Groups library sprites and their mirrored variants by shape into stacked arrays."""
+        grouped = {}
+        for is_mirrored in (False, True):
+            for name, sprite_array in self.processed_sprites:
+                candidate = np.fliplr(sprite_array) if is_mirrored else sprite_array
+                grouped.setdefault(sprite_array.shape, []).append((name, is_mirrored, candidate))
+
+        self._size_groups = {}
+        for shape, entries in grouped.items():
+            stack = np.stack([candidate for _, _, candidate in entries]).astype(np.int16)
+            hashes = self._average_hash(stack) if self.phash_max_distance is not None else None
+            self._size_groups[shape] = (
+                [name for name, _, _ in entries],
+                [is_mirrored for _, is_mirrored, _ in entries],
+                stack,
+                hashes
+            )
+
+    @staticmethod
+    def _average_hash(stack):
         """
-        Finds the best matching library sprite for each frame and determines if the
-        match was a mirrored one.
+        Computes a PHASH_SIZE x PHASH_SIZE average hash for each array of an (N, h, w, 4) stack,
+        using the alpha-weighted luminance sampled on a regular grid.
+        """
+        h, w = stack.shape[1:3]
+        ys = (np.arange(PHASH_SIZE) * h) // PHASH_SIZE
+        xs = (np.arange(PHASH_SIZE) * w) // PHASH_SIZE
+        samples = stack[:, ys][:, :, xs].astype(np.float32)
+        luma = (samples[..., 0] * 0.299 + samples[..., 1] * 0.587 + samples[..., 2] * 0.114) * (samples[..., 3] / 255.0)
+        luma = luma.reshape(len(stack), -1)
+        return luma > luma.mean(axis=1, keepdims=True)
+
+    def _find_near_match(self, target_array):
+        """
+        Tolerant lookup: scores every same-sized library sprite (direct and mirrored) at
+        once and returns the closest one if it is within `self.tolerance`. Ties prefer
+        direct matches, then library order.
 
         Returns:
-            A dictionary containing:
-            - "frame_matches": A list of sprite numbers (e.g., [10, 11, 12]).
-            - "per_frame_mirror": A list of booleans indicating if each individual match was mirrored.
+            A (filename, is_mirrored) tuple, or (None, False) if nothing is close enough.
+        """
+        if target_array is None or self.tolerance is None:
+            return None, False
+        if self._size_groups is None:
+            self._build_size_groups()
+
+        group = self._size_groups.get(target_array.shape)
+        if group is None:
+            return None, False
+        names, mirror_flags, stack, hashes = group
+
+        candidates = np.arange(len(names))
+        if hashes is not None:
+            target_hash = self._average_hash(target_array[np.newaxis].astype(np.int16))
+            hamming = np.count_nonzero(hashes != target_hash, axis=1)
+            candidates = np.flatnonzero(hamming <= self.phash_max_distance)
+            if not len(candidates):
+                return None, False
+
+        distances = np.abs(stack[candidates] - target_array.astype(np.int16)).mean(axis=(1, 2, 3))
+        best = int(np.argmin(distances))
+        if distances[best] > self.tolerance:
+            return None, False
+        index = candidates[best]
+        return names[index], mirror_flags[index]
+
+    @staticmethod
+    def _frame_key(frame):
+        """Builds the deduplication key of an uncropped animation frame."""
+        return frame.size, frame.mode, hashlib.blake2b(frame.tobytes()).digest()
+
+    def match_frames(self, frames):
+        """
+        Batch version of match_group for every frame of an animation, or of a whole
+        character. Each frame is hashed once; only frames this matcher has not seen
+        before are cropped and looked up, and the results are fanned back out. Repeated
+        poses and duplicate sheets (e.g. a `CopyOf` animation sharing Walk's PNG) are
+        therefore matched only once per matcher.
+
+        Returns:
+            The same dictionary as match_group, with one entry per input frame.
         """
         frame_results = []
-        for frame in group_frames:
-            match_filename = None
-            is_mirrored = False
-            
-            processed_frame = self._preprocess_sprite(frame)
-            
-            # 1. Try a direct match
-            match_filename = self._find_match(processed_frame)
-            
-            # 2. If no direct match, try a mirrored match
-            if not match_filename and processed_frame is not None:
-                mirrored_frame = np.fliplr(processed_frame)
-                match_filename = self._find_match(mirrored_frame)
-                if match_filename:
-                    is_mirrored = True
-            
-            frame_results.append((match_filename, is_mirrored))
+        for frame in frames:
+            key = self._frame_key(frame)
+            result = self._frame_results.get(key)
+            if result is None:
+                target_array = self._preprocess_sprite(frame)
+                result = self._find_match(target_array)
+                if result[0] is None and self.tolerance is not None:
+                    result = self._find_near_match(target_array)
+                self._frame_results[key] = result
+            frame_results.append(result)
         
         sprite_numbers = []
         per_frame_mirror_flags = []
@@ -101,4 +322,16 @@ class SpriteMatcher:
         return {
             "frame_matches": sprite_numbers,
             "per_frame_mirror": per_frame_mirror_flags
-        }
\ No newline at end of file
+        }
+
+    def match_group(self, group_frames):
+        """
+        Finds the best matching library sprite for each frame and determines if the
+        match was a mirrored one.
+
+        Returns:
+            A dictionary containing:
+            - "frame_matches": A list of sprite numbers (e.g., [10, 11, 12]).
+            - "per_frame_mirror": A list of booleans indicating if each individual match was mirrored.
+        """
+        return self.match_frames(group_frames)
\ No newline at end of file
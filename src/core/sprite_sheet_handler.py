@@ -1,5 +1,61 @@
 from PIL import Image
 import os
+import numpy as np
+
+class FrameView:
+    """
+    Lightweight RGBA frame backed by a slice of a decoded sheet array (no pixel copy).
+    It exposes the subset of the PIL Image API used by the processing code; a PIL
+    image is only created on demand (to_image, copy, convert, save).
+    """
+    mode = 'RGBA'
+
+    def __init__(self, array):
+        self.array = array
+
+    @property
+    def size(self):
+        return self.array.shape[1], self.array.shape[0]
+
+    @property
+    def width(self):
+        return self.array.shape[1]
+
+    @property
+    def height(self):
+        return self.array.shape[0]
+
+    def __array__(self, dtype=None, copy=None):
+        return self.array if dtype is None else self.array.astype(dtype)
+
+    def getbbox(self):
+        """Bounding box of the non-transparent pixels, like Image.getbbox for RGBA."""
+        alpha = self.array[..., 3]
+        rows = np.flatnonzero(alpha.any(axis=1))
+        if not len(rows):
+            return None
+        cols = np.flatnonzero(alpha.any(axis=0))
+        return int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1
+
+    def crop(self, box):
+        """Returns a view of a sub-rectangle (the box must lie inside the frame)."""
+        left, top, right, bottom = box
+        return FrameView(self.array[top:bottom, left:right])
+
+    def tobytes(self):
+        return self.array.tobytes()
+
+    def to_image(self):
+        return Image.fromarray(np.ascontiguousarray(self.array), 'RGBA')
+
+    def copy(self):
+        return self.to_image()
+
+    def convert(self, mode):
+        return self if mode == 'RGBA' else self.to_image().convert(mode)
+
+    def save(self, *args, **kwargs):
+        self.to_image().save(*args, **kwargs)
 
 class SpriteSheetHandler:
     def __init__(self, image_path, remove_first_row=False, remove_first_col=False):
@@ -11,6 +67,7 @@ class SpriteSheetHandler:
         """
         self.image_path = image_path
         self.image = Image.open(image_path)
+        self._array = None
         self.remove_first_row = remove_first_row
         self.remove_first_col = remove_first_col
 
@@ -50,11 +107,22 @@ class SpriteSheetHandler:
 
         return sprites, final_sprite_width, final_sprite_height
 
-    def split_animation_frames(self, frame_width, frame_height):
+    def get_array(self):
+        """
+        Decode the sheet once into an RGBA NumPy array (cached).
+        :return: Array of shape (height, width, 4).
+        """
+        if self._array is None:
+            image = self.image if self.image.mode == 'RGBA' else self.image.convert('RGBA')
+            self._array = np.asarray(image)
+        return self._array
+
+    def split_animation_frames(self, frame_width, frame_height, as_views=False):
         """
         Split an animation image into frames.
         :param frame_width: Width of each frame.
         :param frame_height: Height of each frame.
+        :param as_views: If True, return FrameView slices of the decoded RGBA sheet instead of PIL crops.
         :return: List of cropped frames.
         """
         frames = []
@@ -66,6 +134,9 @@ class SpriteSheetHandler:
         if frame_height is None:
             frame_height = height
 
+        if as_views:
+            return self._split_frame_views(frame_width, frame_height)
+
         for y in range(0, height, frame_height):
             for x in range(0, width, frame_width):
                 frame = self.image.crop((x, y, x + frame_width, y + frame_height))
@@ -73,6 +144,21 @@ class SpriteSheetHandler:
 
         return frames
 
+    def _split_frame_views(self, frame_width, frame_height):
+        """Array-backed split_animation_frames: same frame order and edge padding, no crops."""
+        pixels = self.get_array()
+        height, width = pixels.shape[:2]
+        rows, cols = -(-height // frame_height), -(-width // frame_width)
+        # Pad partial edge frames with transparency, like Image.crop does.
+        if (rows * frame_height, cols * frame_width) != (height, width):
+            padded = np.zeros((rows * frame_height, cols * frame_width, 4), dtype=pixels.dtype)
+            padded[:height, :width] = pixels
+            pixels = padded
+
+        return [FrameView(pixels[y:y + frame_height, x:x + frame_width])
+                for y in range(0, rows * frame_height, frame_height)
+                for x in range(0, cols * frame_width, frame_width)]
+
     def save_sprites(self, sprites, output_folder, base_name):
         """
         Save the sprites to the specified output folder.
@@ -5,6 +5,7 @@ from PIL import Image, ImageTk, ImageOps, ImageDraw
 from core.sprite_sheet_handler import SpriteSheetHandler
 from ui.animation_player import AnimationPlayer
 from core import isometric_renderer, image_utils
+from core.animation_data_handler import get_optimized_sprite_folder
 import os
 import json
 import math
@@ -160,7 +161,7 @@ class AnimationCreator:
             
             json_dir = os.path.dirname(file_path)
             anim_name = os.path.basename(file_path).replace("-AnimData.json", "")
-            sprite_folder = os.path.join(json_dir, anim_name)
+            sprite_folder = get_optimized_sprite_folder(json_dir, anim_name, json_data)
 
             if not os.path.exists(sprite_folder):
                 messagebox.showerror("Error", f"Sprite folder for this animation not found at:\n{sprite_folder}")
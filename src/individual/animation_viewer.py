@@ -7,6 +7,10 @@ from PIL import Image, ImageTk, ImageOps
 import math
 from ui.animation_group_ui import AnimationGroupUI
 from core.animation_data_handler import AnimationDataHandler
+from core import image_utils
+from core.log_utils import get_logger
+
+logger = get_logger(__name__)
 
 class AnimationViewer:
     def __init__(self, parent_frame, anim_folder):
@@ -331,10 +335,13 @@ class AnimationViewer:
             if error:
                 messagebox.showerror("Export Error", error)
             else:
+                self._record_generation([json_data['name']])
+                self._release_project_caches()
                 messagebox.showinfo("Success", f"Optimized animation saved for {json_data['name']} in:\n{os.path.dirname(output_path)}")
 
     def save_all_animations(self):
         saved_count, failed_count = 0, 0
+        saved_names = []
         
         for index, anim in enumerate(self.anim_data):
             json_data = None
@@ -350,11 +357,30 @@ class AnimationViewer:
                     failed_count += 1
                 else:
                     saved_count += 1
+                    saved_names.append(anim['name'])
             else:
                 failed_count += 1
         
+        self._record_generation(saved_names)
+        self._release_project_caches()
         messagebox.showinfo("Batch Export Complete", f"Process finished.\n\nTotal Animations Exported: {saved_count}\nFailed/Skipped: {failed_count}")
 
+    def _record_generation(self, anim_names):
+        # Saved (possibly hand-edited) exports are recorded in the generation manifest so
+        # the batch tools treat them as up to date instead of regenerating them.
+        try:
+            self.data_handler.record_generation(anim_names)
+        except Exception as e:
+            print(f"Warning: Could not update the generation manifest: {e}")
+
+    def _release_project_caches(self):
+        # The handler lives as long as the window, so after a save drop its matcher,
+        # placement bounds, export palette and the decoded sprites; the next export
+        # rebuilds them from the Sprites folder as it is then (edited or added sprites).
+        logger.debug("Sprite cache before release: %s", image_utils.get_sprite_cache_stats())
+        self.data_handler.clear()
+        image_utils.clear_sprite_cache()
+
     def load_and_convert_optimized_json(self, anim_name):
         folder_name = "AnimationData"
         json_path = os.path.join(self.anim_folder, folder_name, f"{anim_name}-AnimData.json")
@@ -366,10 +392,12 @@ class AnimationViewer:
         
         ui_data = optimized_data.copy()
         ui_data['sprites'] = {}
+        # Pooled exports reference content ids; map them back to library sprite names.
+        sprite_sources = optimized_data.get('sprite_sources', {})
         for group_id, group_data in optimized_data.get('sprites', {}).items():
             ui_group = {'name': group_data.get('name'), 'values': []}
             for frame in group_data.get('frames', []):
-                sprite_id_str = frame.get('id', '0')
+                sprite_id_str = sprite_sources.get(frame.get('id', '0'), frame.get('id', '0'))
                 is_mirrored = "_mirrored" in sprite_id_str
                 base_id = int(sprite_id_str.replace("_mirrored", "")) if sprite_id_str.replace("_mirrored", "").isdigit() else 0
                 ui_group['values'].append({'id': base_id, 'mirrored': is_mirrored})
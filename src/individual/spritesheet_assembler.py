@@ -7,6 +7,7 @@ import queue
 import pathlib
 from tkinter import Frame, Label, Button, Checkbutton, BooleanVar, Text, Scrollbar, END, messagebox, Canvas
 from PIL import Image, ImageOps
+from core.animation_data_handler import get_optimized_sprite_folder
 
 class SpritesheetAssembler:
     def __init__(self, parent_frame, folder, return_to_main_callback, update_breadcrumbs_callback=None, base_path=None):
@@ -188,7 +189,7 @@ class SpritesheetAssembler:
             with open(json_path, 'r') as f:
                 data = json.load(f)
 
-            sprite_folder = os.path.join(self.anim_data_folder, anim_name)
+            sprite_folder = get_optimized_sprite_folder(self.anim_data_folder, anim_name, data)
             if not os.path.exists(sprite_folder):
                 q.put(f"  [ERROR] Sprite folder not found for '{anim_name}'. Skipping.")
                 return False